@@ -0,0 +1,240 @@
+# distanceCalculator.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+This file contains a Distancer object which computes and caches the shortest
+path between any two open cells of a maze.
+
+The table is filled by a breadth first search from every open cell and kept in
+a flat array, so a lookup is two dictionary hits and one array index.  Tables
+are cached in memory for the rest of the run and on disk in DISTANCE_CACHE_DIR,
+keyed by a hash of the walls of the layout, so a maze is only ever solved once:
+
+  distancer = getDistancer(gameState.getWalls())
+  distancer.getDistance((1,1), (5,3))
+"""
+
+import array
+import hashlib
+import heapq
+import os
+
+DISTANCE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.distanceCache')
+DISTANCE_MAP_CACHE = {}
+
+class Distancer:
+    """
+    All-pairs maze distances over the open cells of a walls Grid (game.py).
+    Cells that cannot reach each other are UNREACHABLE apart.
+    """
+    UNREACHABLE = 65535
+
+    def __init__(self, walls, table=None):
+        self.walls = walls
+        self.cells = [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]]
+        self.index = dict((cell, i) for i, cell in enumerate(self.cells))
+        if table == None or len(table) != len(self.cells) ** 2:
+            table = self.computeDistances()
+        self.table = table
+
+    def computeDistances(self):
+        "Runs a breadth first search from every open cell"
+        n = len(self.cells)
+        neighbors = []
+        for x, y in self.cells:
+            adjacent = [(x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)]
+            neighbors.append([self.index[cell] for cell in adjacent if cell in self.index])
+
+        table = array.array('H', [self.UNREACHABLE]) * (n * n)
+        for source in range(n):
+            row = source * n
+            table[row + source] = 0
+            frontier = [source]
+            distance = 0
+            while frontier:
+                distance += 1
+                nextFrontier = []
+                for cell in frontier:
+                    for neighbor in neighbors[cell]:
+                        if table[row + neighbor] == self.UNREACHABLE:
+                            table[row + neighbor] = distance
+                            nextFrontier.append(neighbor)
+                frontier = nextFrontier
+        return table
+
+    def getDistance(self, pos1, pos2):
+        "The maze distance between two open cells"
+        return self.table[self.index[pos1] * len(self.cells) + self.index[pos2]]
+
+    def getDistances(self, pos, positions):
+        "The maze distances from pos to each of the positions, as a list"
+        row = self.index[pos] * len(self.cells)
+        table, index = self.table, self.index
+        return [table[row + index[other]] for other in positions]
+
+    def getDistancesFrom(self, pos):
+        "A dictionary from every open cell to its maze distance from pos"
+        n = len(self.cells)
+        row = self.index[pos] * n
+        return dict((self.cells[i], self.table[row + i]) for i in range(n))
+
+class NearestFoodField:
+    """
+    The maze distance from every open cell to the closest remaining food,
+    kept up to date as food is eaten.
+
+    Building the field is one breadth first search seeded with all the food at
+    once.  removeFood only repairs the cells whose closest food was the one
+    that disappeared, so eating a dot costs time in proportion to the area it
+    was the closest dot for rather than to the whole maze.  The path to the
+    closest dot from any cell is then found by walking downhill in the field.
+    """
+    UNREACHABLE = Distancer.UNREACHABLE
+
+    def __init__(self, walls, food):
+        self.cells = [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]]
+        self.index = dict((cell, i) for i, cell in enumerate(self.cells))
+        self.neighbors = []
+        for x, y in self.cells:
+            adjacent = [(x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)]
+            self.neighbors.append([self.index[cell] for cell in adjacent if cell in self.index])
+
+        self.sources = set([self.index[cell] for cell in food.asList() if cell in self.index])
+        self.distances = [self.UNREACHABLE] * len(self.cells)
+        frontier = list(self.sources)
+        for source in frontier:
+            self.distances[source] = 0
+        distance = 0
+        while frontier:
+            distance += 1
+            nextFrontier = []
+            for cell in frontier:
+                for neighbor in self.neighbors[cell]:
+                    if self.distances[neighbor] == self.UNREACHABLE:
+                        self.distances[neighbor] = distance
+                        nextFrontier.append(neighbor)
+            frontier = nextFrontier
+
+    def getDistance(self, pos):
+        "The maze distance from pos to the closest remaining food"
+        return self.distances[self.index[pos]]
+
+    def removeFood(self, pos):
+        "Updates the field after the food at pos was eaten"
+        source = self.index.get(pos)
+        if source not in self.sources:
+            return
+        self.sources.remove(source)
+        distances, neighbors = self.distances, self.neighbors
+
+        # A cell loses its distance when every neighbor one step closer to the
+        # food lost theirs.  Going out one layer at a time, all the neighbors
+        # that could support a cell are decided before the cell itself.
+        invalid = set([source])
+        layer = [source]
+        while layer:
+            candidates = set()
+            for cell in layer:
+                for neighbor in neighbors[cell]:
+                    if distances[neighbor] == distances[cell] + 1 and neighbor not in invalid:
+                        candidates.add(neighbor)
+            layer = [cell for cell in candidates
+                     if all([other in invalid for other in neighbors[cell]
+                             if distances[other] == distances[cell] - 1])]
+            invalid.update(layer)
+
+        # Refill the invalid region from its border with the rest of the field
+        for cell in invalid:
+            distances[cell] = self.UNREACHABLE
+        heap = []
+        for cell in invalid:
+            border = [distances[other] + 1 for other in neighbors[cell] if other not in invalid]
+            if border and min(border) < distances[cell]:
+                distances[cell] = min(border)
+                heap.append((distances[cell], cell))
+        heapq.heapify(heap)
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            if distance > distances[cell]:
+                continue
+            for neighbor in neighbors[cell]:
+                if distance + 1 < distances[neighbor]:
+                    distances[neighbor] = distance + 1
+                    heapq.heappush(heap, (distance + 1, neighbor))
+
+    def pathToNearest(self, pos):
+        """
+        The cells on a shortest path from pos to the closest remaining food,
+        ending with the food itself.  Empty if pos holds food or no food is
+        reachable.
+        """
+        cell = self.index[pos]
+        distances = self.distances
+        if distances[cell] == self.UNREACHABLE:
+            return []
+        path = []
+        while distances[cell] > 0:
+            cell = [other for other in self.neighbors[cell] if distances[other] == distances[cell] - 1][0]
+            path.append(self.cells[cell])
+        return path
+
+def layoutKey(walls):
+    "A hash of the walls of a layout, used to name its cache file"
+    return hashlib.sha1(str(walls)).hexdigest()
+
+def getDistancer(walls):
+    """
+    Returns the Distancer for a walls Grid, computing it only if neither the
+    memory nor the disk cache already holds a table for that maze.
+    """
+    key = layoutKey(walls)
+    if key in DISTANCE_MAP_CACHE:
+        return DISTANCE_MAP_CACHE[key]
+
+    path = os.path.join(DISTANCE_CACHE_DIR, key + '.dist')
+    distancer = Distancer(walls, readTable(path))
+    if not os.path.exists(path) or len(distancer.table) * distancer.table.itemsize != os.path.getsize(path):
+        writeTable(path, distancer.table)
+    DISTANCE_MAP_CACHE[key] = distancer
+    return distancer
+
+def readTable(path):
+    "Loads a distance table written by writeTable, or None if there is none"
+    if not os.path.exists(path):
+        return None
+    table = array.array('H')
+    try:
+        f = open(path, 'rb')
+        try:
+            table.fromstring(f.read())
+        finally:
+            f.close()
+    except (IOError, ValueError):
+        return None
+    return table
+
+def writeTable(path, table):
+    "Stores a distance table; a cache that cannot be written is simply skipped"
+    try:
+        if not os.path.isdir(DISTANCE_CACHE_DIR):
+            os.makedirs(DISTANCE_CACHE_DIR)
+        tmpPath = '%s.%d.tmp' % (path, os.getpid())
+        f = open(tmpPath, 'wb')
+        try:
+            f.write(table.tostring())
+        finally:
+            f.close()
+        os.rename(tmpPath, path)
+    except (IOError, OSError):
+        pass
@@ -0,0 +1,157 @@
+# foodHeuristics.py
+# -----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Admissible and consistent heuristics for the FoodSearchProblem and the
+CornersProblem, all built on exact maze distances (distanceCalculator.py).
+
+Every heuristic here is the sum of two parts: a bound that only depends on the
+set of remaining targets (the weight of their minimum spanning tree, or the
+length of their farthest pair), and the maze distance from Pacman to the
+closest target that bound can start from.  The first part is by far the more
+expensive one and it is the same for every state that has the same food left,
+so it is memoized per problem in a SubproblemCache keyed by the food Bitboard.
+
+They are imported into searchAgents.py, so they can be selected with e.g.
+
+> python pacman.py -l trickySearch -p SearchAgent -a fn=astar,prob=FoodSearchProblem,heuristic=mstFoodHeuristic
+
+"python searchBenchmark.py food" compares them on the search layouts.
+"""
+
+import collections
+import distanceCalculator
+
+SUBPROBLEM_CACHE_SIZE = 100000
+
+class SubproblemCache:
+    """
+    A memo of subproblem bounds with a least recently used eviction policy:
+    once more than 'capacity' entries are stored, the entry that was read or
+    written the longest time ago is dropped.  hits, misses and evictions count
+    how well the cache is doing.
+    """
+    def __init__(self, capacity=SUBPROBLEM_CACHE_SIZE):
+        self.capacity = capacity
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, computeFn):
+        "Returns the value stored for key, calling computeFn() to fill it in if needed"
+        if key in self.entries:
+            self.hits += 1
+            value = self.entries.pop(key)
+        else:
+            self.misses += 1
+            value = computeFn()
+            if len(self.entries) >= self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        self.entries[key] = value
+        return value
+
+def getHeuristicInfo(problem):
+    """
+    The per-problem dictionary the heuristics keep their distancer and caches in.
+    FoodSearchProblem already has one; other problems get one the first time.
+    """
+    if 'heuristicInfo' not in dir(problem):
+        problem.heuristicInfo = {}
+    return problem.heuristicInfo
+
+def getDistancer(problem):
+    info = getHeuristicInfo(problem)
+    if 'distancer' not in info:
+        info['distancer'] = distanceCalculator.getDistancer(problem.walls)
+    return info['distancer']
+
+def getCache(problem, name):
+    info = getHeuristicInfo(problem)
+    if name not in info:
+        info[name] = SubproblemCache()
+    return info[name]
+
+def spanningTreeWeight(targets, distancer):
+    "Weight of the minimum spanning tree over targets under maze distance (Prim)"
+    if len(targets) < 2:
+        return 0
+    remaining = list(targets[1:])
+    bestEdge = distancer.getDistances(targets[0], remaining)
+    weight = 0
+    while remaining:
+        i = bestEdge.index(min(bestEdge))
+        weight += bestEdge.pop(i)
+        closest = remaining.pop(i)
+        bestEdge = map(min, bestEdge, distancer.getDistances(closest, remaining))
+    return weight
+
+def farthestPair(targets, distancer):
+    "The two targets that are farthest apart, and their maze distance"
+    if len(targets) < 2:
+        return tuple(targets), 0
+    best = (targets[0], targets[0]), 0
+    for i in range(len(targets) - 1):
+        distances = distancer.getDistances(targets[i], targets[i + 1:])
+        farthest = max(distances)
+        if farthest > best[1]:
+            best = (targets[i], targets[i + 1 + distances.index(farthest)]), farthest
+    return best
+
+def mstBound(position, targets, key, problem):
+    """
+    Distance from position to the closest target plus the weight of the
+    minimum spanning tree of all targets.  Any tour from position must first
+    reach some target and then connect all of them, so this never overestimates.
+    """
+    if len(targets) == 0:
+        return 0
+    distancer = getDistancer(problem)
+    weight = getCache(problem, 'mstCache').get(key, lambda: spanningTreeWeight(targets, distancer))
+    return min(distancer.getDistances(position, targets)) + weight
+
+def farthestPairBound(position, targets, key, problem):
+    """
+    For the farthest pair of targets (a,b): reaching the closer of the two and
+    then the other one is a lower bound on visiting every target.
+    """
+    if len(targets) == 0:
+        return 0
+    distancer = getDistancer(problem)
+    pair, distance = getCache(problem, 'pairCache').get(key, lambda: farthestPair(targets, distancer))
+    return min(distancer.getDistances(position, pair)) + distance
+
+def mstFoodHeuristic(state, problem):
+    "Minimum spanning tree bound for the FoodSearchProblem"
+    position, foodGrid = state
+    return mstBound(position, foodGrid.asList(), foodGrid, problem)
+
+def farthestPairFoodHeuristic(state, problem):
+    "Farthest pair bound for the FoodSearchProblem"
+    position, foodGrid = state
+    return farthestPairBound(position, foodGrid.asList(), foodGrid, problem)
+
+def maxFoodHeuristic(state, problem):
+    "The larger of the spanning tree and farthest pair bounds, still consistent"
+    position, foodGrid = state
+    targets = foodGrid.asList()
+    return max(mstBound(position, targets, foodGrid, problem),
+               farthestPairBound(position, targets, foodGrid, problem))
+
+def mstCornersHeuristic(state, problem):
+    "Minimum spanning tree bound over the corners that were not visited yet"
+    position, corners, visitedFlag = state
+    targets = [corner for corner, flag in zip(corners, visitedFlag) if flag == 0]
+    return mstBound(position, targets, visitedFlag, problem)
@@ -280,6 +280,78 @@ def reconstituteGrid(bitRep):
     width, height = bitRep[:2]
     return Grid(width, height, bitRepresentation= bitRep[2:])
 
+class Bitboard:
+    """
+    An immutable set of cells on a width x height board, packed into the bits of
+    a single integer: cell (x,y) is bit x * height + y, the same cell order that
+    Grid.packBits uses.  It is meant for search states such as the remaining
+    food, where a Grid would be copied for every successor and rehashed cell by
+    cell every time it is looked up.
+
+    eat(x,y) returns a new board without that cell, the hash is computed once,
+    and asList only visits the cells that are set.  toGrid converts back to a
+    Grid for code that displays or indexes the board.
+    """
+    def __init__(self, width, height, bits=0):
+        self.width = width
+        self.height = height
+        self.bits = bits
+        self._hash = hash((width, height, bits))
+
+    def __getitem__(self, x):
+        return [(self.bits >> (x * self.height + y)) & 1 == 1 for y in range(self.height)]
+
+    def __eq__(self, other):
+        if not isinstance(other, Bitboard): return False
+        return self.bits == other.bits and self.width == other.width and self.height == other.height
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return self._hash
+
+    def __str__(self):
+        return str(self.toGrid())
+
+    def isSet(self, x, y):
+        return (self.bits >> (x * self.height + y)) & 1 == 1
+
+    def eat(self, x, y):
+        "Returns the board without cell (x,y); the board itself if it is not set"
+        bit = 1 << (x * self.height + y)
+        if not self.bits & bit:
+            return self
+        return Bitboard(self.width, self.height, self.bits & ~bit)
+
+    def isEmpty(self):
+        return self.bits == 0
+
+    def count(self):
+        return bin(self.bits).count('1')
+
+    def asList(self):
+        list = []
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            list.append(divmod(lowest.bit_length() - 1, self.height))
+            bits ^= lowest
+        return list
+
+    def toGrid(self):
+        grid = Grid(self.width, self.height)
+        for x, y in self.asList():
+            grid[x][y] = True
+        return grid
+
+def gridToBitboard(grid):
+    "Packs the True cells of a Grid into a Bitboard"
+    bits = 0
+    for x, y in grid.asList():
+        bits |= 1 << (x * grid.height + y)
+    return Bitboard(grid.width, grid.height, bits)
+
 ####################################
 # Parts you shouldn't have to read #
 ####################################
@@ -368,6 +440,97 @@ class Actions:
         return (x + dx, y + dy)
     getSuccessor = staticmethod(getSuccessor)
 
+MOVE_TABLES = {}
+
+def getMoveTable(walls):
+    "The MoveTable of a maze, built once for every distinct walls Grid"
+    if walls not in MOVE_TABLES:
+        MOVE_TABLES[walls] = MoveTable(walls)
+    return MOVE_TABLES[walls]
+
+class MoveTable:
+    """
+    The moves the walls of a maze allow from every open position, computed
+    once so the game rules and the search problems look them up instead of
+    testing the walls around an agent at every step.  Use getMoveTable(walls)
+    or Layout.getMoveTable() to get the shared table of a maze.
+
+    getPossibleActions, getGhostActions and getLegalNeighbors answer exactly
+    as Actions.getPossibleActions, GhostRules.getLegalActions and
+    Actions.getLegalNeighbors would, in the same order, and return new lists
+    the caller may change.  Positions that are not in the table (between grid
+    points, as for ghosts moving at half speed) are worked out as before.
+    """
+    SEARCH_DIRECTIONS = [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]
+
+    def __init__(self, walls):
+        self.walls = walls
+        self.actions = {}
+        self.ghostActions = {}
+        self.neighbors = {}
+        self.successors = {}
+        for x in range(walls.width):
+            for y in range(walls.height):
+                if walls[x][y]: continue
+                position = (x, y)
+                actions = Actions.getPossibleActions(Configuration(position, Directions.STOP), walls)
+                self.actions[position] = tuple(actions)
+                for direction in Actions._directions:
+                    self.ghostActions[(position, direction)] = tuple(MoveTable.ghostFilter(actions, direction))
+                self.neighbors[position] = tuple(Actions.getLegalNeighbors(position, walls))
+                self.successors[position] = self.computeSuccessors(position)
+
+    def ghostFilter(actions, direction):
+        """
+        Ghosts cannot stop, and cannot turn around unless they
+        reach a dead end, but can turn 90 degrees at intersections.
+        """
+        possibleActions = [action for action in actions if action != Directions.STOP]
+        reverse = Actions.reverseDirection(direction)
+        if reverse in possibleActions and len(possibleActions) > 1:
+            possibleActions.remove(reverse)
+        return possibleActions
+    ghostFilter = staticmethod(ghostFilter)
+
+    def computeSuccessors(self, position):
+        x, y = position
+        successors = []
+        for action in MoveTable.SEARCH_DIRECTIONS:
+            dx, dy = Actions._directions[action]
+            nextx, nexty = int(x + dx), int(y + dy)
+            if not self.walls[nextx][nexty]:
+                successors.append(((nextx, nexty), action))
+        return tuple(successors)
+
+    def getPossibleActions(self, config):
+        actions = self.actions.get(config.pos)
+        if actions == None:
+            return Actions.getPossibleActions(config, self.walls)
+        return list(actions)
+
+    def getGhostActions(self, config):
+        actions = self.ghostActions.get((config.pos, config.direction))
+        if actions == None:
+            return MoveTable.ghostFilter(Actions.getPossibleActions(config, self.walls), config.direction)
+        return list(actions)
+
+    def getLegalNeighbors(self, position):
+        neighbors = self.neighbors.get(position)
+        if neighbors == None:
+            return Actions.getLegalNeighbors(position, self.walls)
+        return list(neighbors)
+
+    def getSuccessors(self, position):
+        """
+        The (nextPosition, action) pairs of the moves from an integer position
+        that do not hit a wall, in the North, South, East, West order of the
+        search problems.  The result is a tuple shared by all callers.
+        """
+        successors = self.successors.get(position)
+        if successors == None:
+            return self.computeSuccessors(position)
+        return successors
+
 class GameStateData:
     """
 
@@ -13,7 +13,7 @@
 
 
 from util import manhattanDistance
-from game import Grid
+from game import Grid, getMoveTable
 import os
 import random
 
@@ -23,6 +23,7 @@ class Layout:
     """
     A Layout manages the static information about the game board.
     """
+    moveTable = None # built by getMoveTable when it is first needed
 
     def __init__(self, layoutText):
         self.width = len(layoutText[0])
@@ -61,6 +62,12 @@ class Layout:
         else:
             self.visibility = VISIBILITY_MATRIX_CACHE[reduce(str.__add__, self.layoutText)]
 
+    def getMoveTable(self):
+        "The legal actions and neighbors of every position (a MoveTable in game.py)"
+        if self.moveTable == None:
+            self.moveTable = getMoveTable(self.walls)
+        return self.moveTable
+
     def isWall(self, pos):
         x, col = pos
         return self.walls[x][col]
@@ -90,7 +97,15 @@ class Layout:
         return "\n".join(self.layoutText)
 
     def deepCopy(self):
-        return Layout(self.layoutText[:])
+        layout = Layout(self.layoutText[:])
+        layout.moveTable = self.moveTable
+        return layout
+
+    def __getstate__(self):
+        "Pickles leave the move table out; it is cheaper to rebuild than to send"
+        state = self.__dict__.copy()
+        state.pop('moveTable', None)
+        return state
 
     def processLayoutText(self, layoutText):
         """
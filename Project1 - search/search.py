@@ -18,6 +18,7 @@ Pacman agents (in searchAgents.py).
 """
 
 import util
+import heapq
 
 class SearchProblem:
     """
@@ -116,191 +117,491 @@ def nullHeuristic(state, problem=None):
     """
     return 0
 
+def isNullHeuristic(heuristic):
+    """
+    True for nullHeuristic, also behind wrappers (such as the counting ones of
+    searchInstrumentation.py) that keep the function they wrap as __wrapped__.
+    """
+    while hasattr(heuristic, '__wrapped__'):
+        heuristic = heuristic.__wrapped__
+    return heuristic == nullHeuristic
+
 def aStarSearch(problem, heuristic=nullHeuristic):
     """Search the node that has the lowest combined cost and heuristic first."""
     "*** YOUR CODE HERE ***"
     
     """ FUNCTIONALITY DESCRIPTION
-    this is technically the same graph but implemented here to avoid complications of
-    priority queue with a fucntion. the huristic fucntion is explained in the proceeding 
+    A* is the same graph search as UCS, only the priority of every pushed node
+    is the cumulative cost plus ONE heuristic estimate of the node's state.
     """
-    
-    
-    #print "Start:", problem.getStartState()
-    #print "Is the start a goal?", problem.isGoalState(problem.getStartState()) 
-    #print "Start's successors:", problem.getSuccessors(problem.getStartState())
-    "list of visited nodes"
-    visited = []
-    node = []
-    
-    "for A8 the best data structure is priority queue with huristic. the huristic is defiined here"
-    frontierPath = util.PriorityQueue()
-    firstElem = [(problem.getStartState(), " ")]
-    frontierPath.push(firstElem, 0)
-   
-
-    while True is True: 
-        node = frontierPath.pop()
-        for i in range (0,len(node)):
-            lenNode = len(node)
-  	    lastNode = node[i]
-  	lastNodeXY = lastNode[0]
-  	
-  	returnVal = []
-  	for i in range(1,lenNode):
-  	    "this loop always keeps the return diection updated to the latest path by taking the values form node and updaing"
-  	    nodeXY = node[i]
-  	    returnVal.append(nodeXY[1])
-      	    
-  	    
-        if problem.isGoalState(lastNodeXY) is True:
-            "if this is the goal, return the value "
-  	    return returnVal
-
- 	if lastNodeXY in visited:
-            "if lastNodeXY is among the visited then do nothing, it is already visited. This is to avoid redundancy "
- 	    #print " XY IS ALREADY IN VISITED LIST! "
- 	    pass
-  	else:
-  	    visited.append(lastNodeXY)
-  	    newSucessors = problem.getSuccessors(lastNodeXY)
- 	    for ii in range(0, len(newSucessors)):
-  	        succ = newSucessors[ii]
-  	        if succ[0] in visited:
-  	            #print " SUCCESSOR ALREADY ADDED! "
-  	            pass
-  	             
-  	        else :
-  	            newSuccPath = []
-  	            for i in range(0,len(node)):
-  	                newSuccPath.append(node[i])
-  	            newSuccPath.append(succ)
-  	            cost = 0
-  	            for i in range(1,len(newSuccPath)):
-  	                passTemp = newSuccPath[i]
-  	                cost = cost + passTemp[2]
-  	            "for every point cost is calculated as the cumilative distance + ONE huristic "
-  	            #print "pass temp", passTemp[0]
-  	            cost = cost + heuristic(passTemp[0], problem)
-  	            #print "cost", cost
-  	            #print "heuristic", heuristic(passTemp[2], problem)
-  	            frontierPath.push(newSuccPath, cost)
+    return graph(problem, 3, heuristic)
 
-    
-    util.raiseNotDefined()
-
-def graph(problem, inputType):
+def graph(problem, inputType, heuristic=nullHeuristic):
     """ FUNCTIONALITY DESCRIPTION
-    depending on what is the input number it iterats between stack, queue and Priority queue
-    and initialize the problem. Then push the first node which is the current node into the frontierPath. 
-    from this moment depending on the data structure nodes are pushed and poped from the structure.
-    The esiest way to deal with this problem is using the same architecture that the get successor function 
-    returns and putting appending all of then in a list and retuning. In this case, there is less hastile dealing
-    with stack object. I also implemented a seprate code with just the last node and the whole path but it had etechnical
-    issues. then, I changed to this one. I left them commented at the enf of this code
-    
+    depending on what is the input number it iterates between stack, queue and
+    priority queue and pushes the start node into the frontier. From this moment
+    nodes are pushed and popped from the structure until the goal is popped.
+
     1: Stack         --> good for DFS
     2: Queue         --> good for BFS
-    3: PriorityQueue --> good for UCS
-    
-    PriorityQueue is also good for A* but due to complexity of implementation A* has a separate 
-    implemetation 
-    
+    3: PriorityQueue --> good for UCS, and for A* when a heuristic is given
+
+    Every node is a record (state, action, cost, parent) where parent is the
+    record of the node it was expanded from. A pushed successor therefore costs
+    one small tuple instead of a copy of the whole path, and the list of actions
+    is only rebuilt by walking the parent pointers once the goal is popped.
+    Expanded states are kept in a set so the visited check is O(1).
+
+    For 3 the frontier is an IndexedPriorityQueue of states and the node records
+    live in a dictionary, one per queued state. Reaching a queued state through a
+    cheaper path lowers its priority and replaces its record instead of pushing
+    the state again. The heap counters are left in problem._frontierStats; for
+    1 and 2 it only holds the peak number of nodes on the frontier (peakSize).
     """
     if   inputType == 1:
         frontierPath = util.Stack()
-        
-        #firstElem = [(problem.getStartState(), "NA", problem.getStartState(), problem.getStartState())]
-        firstElem = [(problem.getStartState(), " ")]
-        frontierPath.push(firstElem)
-        
     elif inputType == 2:
         frontierPath = util.Queue()
-        #firstElem = [(problem.getStartState(), "NA", problem.getStartState(), problem.getStartState())]
-        firstElem = [(problem.getStartState(), " ")]        
-        frontierPath.push(firstElem)
-        
     elif inputType == 3:
-        frontierPath = util.PriorityQueue()
-        #firstElem = [(problem.getStartState(), "NA", problem.getStartState(), problem.getStartState())]
-        firstElem = [(problem.getStartState(), " ")]        
-        frontierPath.push(firstElem, 0)
-        
-        
-    #print "Start:", problem.getStartState()
-    #print "Is the start a goal?", problem.isGoalState(problem.getStartState()) 
-    #print "Start's successors:", problem.getSuccessors(problem.getStartState())
-    visited = []
-    node = []
-    
-
-    while True is True:
-        "pop value from the frontierPath and put in node" 
-        node = frontierPath.pop()
-        
-        for i in range (0,len(node)):
-            lenNode = len(node)
-  	    lastNode = node[i]
-  	"this is the last node on the list, which will be used for to find sucessors"
-  	lastNodeXY = lastNode[0]
-  	
-  	returnVal = []
-  	for i in range(1,lenNode):
-  	    "this loop always keeps the return diection updated to the latest path by taking the values form node and updaing"
-  	    nodeXY = node[i]
-  	    returnVal.append(nodeXY[1])
-      	    
-  	    
-        if problem.isGoalState(lastNodeXY) is True:
-            "if this is the goal, return the value. the list is already made up. this is all the W E N S"
-  	    return returnVal
-
- 	if lastNodeXY in visited:
-            "if lastNodeXY is among the visited then do nothing, it is already visited. This is to avoid redundancy "
- 	    #print " XY IS ALREADY IN VISITED LIST! "
- 	    pass
-  	else:
-            "if lastNodeXY is NOT (else) among the visited, then append the node to teh visited and get all sucessor for that point" 
-            "since we took the node as a valid sucessor and we are going to add to the frontierPath then it is visited. This is to avoid reaching to the same sucessor and putting it into stack"
-            
-            visited.append(lastNodeXY)
-            
-            "here is the list of new sucessors"
-  	    newSucessors = problem.getSuccessors(lastNodeXY)
-  	    for ii in range(0, len(newSucessors)):
-  	        succ = newSucessors[ii]
-  	        "if the first value which is the next sucessor is in the visited list then skip"
-  	        if succ[0] not in visited:
-  	            pass
-  	        
-  	        if succ[0] in visited:
-  	            "if sucsessor is in the visited list then do nothing. this is to avoid redundancy"
-  	            #print " SUCCESSOR ALREADY ADDED! "
-  	            pass
-  	             
-  	        else :
-  	            "if sucsessor is not in the visited list then a new path(newSuccPath) has to be made for it by taking all nodes of the path and appending the new node. the reason for a new success path is to avoid messing up the path for next sucessor. each time loop is implemented a new set of newSuccPath is made which will be use exclusively for that path "
-  	            newSuccPath = []
-  	            "this function is similar to the returnVal function. it puts all nodes together and ready for the sucessor to be added"
-  	            for i in range(0,len(node)):
-  	                newSuccPath.append(node[i])
-  	                
-  	            newSuccPath.append(succ)
-  	            "depending on the input number different data structure will be implemented"
-  	            if  inputType==1:
-  	                " if the input type is 1, then push for Stack"
-  	                frontierPath.push(newSuccPath)
-  	            if inputType==2:
-  	                " if the input type is 2, then push for priorityQueue"
-  	                frontierPath.push(newSuccPath)
-  	            if inputType==3:
-  	                "if input is 3 do for usc"
-  	                cost = 0
-  	                "for priority queue, cost is calculated here. cost is calculated as the cost of all steps combined"
-  	                for i in range(1,len(newSuccPath)):
-  	                    passTemp = newSuccPath[i]
-  	                    cost = cost + passTemp[2]
-  	                frontierPath.push(newSuccPath, cost)
+        frontierPath = util.IndexedPriorityQueue()
+        nodes = {}
+    else:
+        raise ValueError('unknown frontier type: %s' % inputType)
+
+    startNode = (problem.getStartState(), None, 0, None)
+    if inputType == 3:
+        frontierPath.push(startNode[0], 0)
+        nodes[startNode[0]] = startNode
+        problem._frontierStats = frontierPath.getStats()
+    else:
+        frontierPath.push(startNode)
+
+    visited = set()
+    peakSize = 1
+    while not frontierPath.isEmpty():
+        if inputType == 3:
+            node = nodes.pop(frontierPath.pop())
+        else:
+            node = frontierPath.pop()
+        state, _, cost, _ = node
+
+        if problem.isGoalState(state):
+            "if this is the goal, follow the parents back to the start"
+            if inputType == 3:
+                problem._frontierStats = frontierPath.getStats()
+            else:
+                problem._frontierStats = {'peakSize': peakSize}
+            return reconstructPath(node)
+
+        if state in visited:
+            "already expanded through a path that was popped earlier"
+            continue
+        visited.add(state)
+
+        for succ, action, stepCost in problem.getSuccessors(state):
+            if succ in visited:
+                continue
+            child = (succ, action, cost + stepCost, node)
+            if inputType == 3:
+                if frontierPath.update(succ, child[2] + heuristic(succ, problem)):
+                    nodes[succ] = child
+            else:
+                frontierPath.push(child)
+        if inputType != 3 and len(frontierPath.list) > peakSize:
+            peakSize = len(frontierPath.list)
+
+    if inputType == 3:
+        problem._frontierStats = frontierPath.getStats()
+    else:
+        problem._frontierStats = {'peakSize': peakSize}
+    return []
+
+def reconstructPath(node):
+    """
+    Returns the list of actions that leads from the start node to the given
+    node of graph(), by following the parent pointers.
+    """
+    actions = []
+    while node[3] is not None:
+        actions.append(node[1])
+        node = node[3]
+    actions.reverse()
+    return actions
+
+def bidirectionalSearch(problem, heuristic=nullHeuristic):
+    """
+    Searches forward from the start and backward from the goal at the same time
+    and joins the two searches where they meet.  Without a heuristic this is
+    bidirectional UCS (BFS on unit costs); with one it is bidirectional A*, where
+    the backward search calls the heuristic on the reversed problem so that it
+    estimates the distance back to the start.
+
+    The problem must have a single goal and provide getReversedProblem(), a
+    SearchProblem that starts at the goal and whose successors are the states
+    that lead into a state, with the forward action and cost of that step (see
+    ReversedPositionSearchProblem in searchAgents.py).
+
+    Each step expands the side with the smaller frontier.  Every time a state is
+    reached that the other side has also reached, the joined path is recorded if
+    it is the cheapest so far.  The search stops once neither frontier can lead
+    to anything cheaper: the two lowest priorities add up to at least the best
+    cost (no heuristic), or either one alone does (consistent heuristic).
+    """
+    problems = (problem, problem.getReversedProblem())
+    frontiers = (util.IndexedPriorityQueue(), util.IndexedPriorityQueue())
+    nodes = ({}, {})
+    "node records of expanded states, per side"
+    closed = ({}, {})
+    for side in (0, 1):
+        start = problems[side].getStartState()
+        nodes[side][start] = (start, None, 0, None)
+        frontiers[side].push(start, heuristic(start, problems[side]))
+
+    def reached(side, state):
+        if state in closed[side]:
+            return closed[side][state]
+        return nodes[side].get(state)
+
+    bestCost, bestMeeting = None, None
+    if problems[0].getStartState() == problems[1].getStartState():
+        bestCost, bestMeeting = 0, (nodes[0][problems[0].getStartState()], nodes[1][problems[1].getStartState()])
+
+    while not frontiers[0].isEmpty() and not frontiers[1].isEmpty():
+        if bestCost != None:
+            forwardMin, backwardMin = frontiers[0].peekPriority(), frontiers[1].peekPriority()
+            if max(forwardMin, backwardMin) >= bestCost:
+                break
+            if isNullHeuristic(heuristic) and forwardMin + backwardMin >= bestCost:
+                break
+
+        if len(frontiers[0].entries) <= len(frontiers[1].entries):
+            side = 0
+        else:
+            side = 1
+        node = nodes[side].pop(frontiers[side].pop())
+        closed[side][node[0]] = node
+
+        for succ, action, stepCost in problems[side].getSuccessors(node[0]):
+            if succ in closed[side]:
+                continue
+            child = (succ, action, node[2] + stepCost, node)
+            if not frontiers[side].update(succ, child[2] + heuristic(succ, problems[side])):
+                continue
+            nodes[side][succ] = child
+
+            other = reached(1 - side, succ)
+            if other != None and (bestCost == None or child[2] + other[2] < bestCost):
+                bestCost = child[2] + other[2]
+                bestMeeting = (child, other) if side == 0 else (other, child)
+
+    problem._frontierStats = dict((key, frontiers[0].getStats()[key] + frontiers[1].getStats()[key])
+                                  for key in frontiers[0].getStats())
+    if bestMeeting == None:
+        return []
+
+    forwardNode, backwardNode = bestMeeting
+    actions = reconstructPath(forwardNode)
+    while backwardNode[3] is not None:
+        "backward records hold the forward move from their state into their parent"
+        actions.append(backwardNode[1])
+        backwardNode = backwardNode[3]
+    return actions
+
+def iterativeDeepeningAStarSearch(problem, heuristic=nullHeuristic):
+    """
+    IDA*: a depth first search that abandons a path as soon as its cost plus
+    heuristic goes over a bound, restarted with the bound raised to the lowest
+    value that went over it last time.  Only the current path and the
+    successors still to try along it are kept, so memory grows with the length
+    of the solution instead of with the frontier.  The price is that states are
+    expanded again on every iteration and along every path that reaches them.
+    Paths are kept free of cycles by checking the states on the current path.
+    The deepest the stack got is left in problem._frontierStats['peakSize'].
+    """
+    start = problem.getStartState()
+    bound = heuristic(start, problem)
+    problem._frontierStats = {'peakSize': 1}
+    while True:
+        "each stack entry is (state, cost, successors still to try)"
+        stack = [(start, 0, None)]
+        actions = []
+        onPath = set([start])
+        nextBound = None
+        while stack:
+            state, cost, successors = stack[-1]
+            if successors == None:
+                f = cost + heuristic(state, problem)
+                if f > bound:
+                    if nextBound == None or f < nextBound:
+                        nextBound = f
+                    successors = []
+                elif problem.isGoalState(state):
+                    return actions
+                else:
+                    successors = problem.getSuccessors(state)
+                    successors.reverse()
+                stack[-1] = (state, cost, successors)
+
+            while successors and successors[-1][0] in onPath:
+                successors.pop()
+            if successors:
+                succ, action, stepCost = successors.pop()
+                stack.append((succ, cost + stepCost, None))
+                actions.append(action)
+                onPath.add(succ)
+                if len(stack) > problem._frontierStats['peakSize']:
+                    problem._frontierStats['peakSize'] = len(stack)
+            else:
+                stack.pop()
+                onPath.discard(state)
+                if actions:
+                    actions.pop()
+        if nextBound == None:
+            "nothing was cut off, so there is no path at all"
+            return []
+        bound = nextBound
+
+def jumpPointSearch(problem, heuristic=nullHeuristic):
+    """
+    A* over jump points for a PositionSearchProblem with unit step costs, read
+    straight off problem.walls (a game.Grid) and problem.goal.
+
+    Instead of putting every neighbouring cell on the frontier, a node only
+    scans in the directions an optimal path could still need, and it only
+    stops at cells where a path may have to turn: the goal, or a cell with a
+    forced neighbour that no other optimal path could have reached first.  On
+    a 4-connected grid the scans are ordered vertical first:
+
+      - moving horizontally, keep going until the goal, a wall, or a cell
+        whose upper (lower) neighbour is open while the one behind it is not
+      - moving vertically, keep going until the goal, a wall, or a cell from
+        which a horizontal scan finds a jump point
+      - a node reached horizontally continues horizontally and turns only to
+        its forced neighbours; a node reached vertically continues vertically
+        and also scans both ways horizontally
+
+    The jump points are expanded like A* nodes (and counted with
+    problem.countExpansion), and the path between them is unrolled into the same
+    list of Directions that aStarSearch returns.
+    """
+    from game import Actions
+    walls, goal = problem.walls, problem.goal
+
+    def blocked(x, y):
+        return x < 0 or y < 0 or x >= walls.width or y >= walls.height or walls[x][y]
+
+    def jumpHorizontal(x, y, dx):
+        while True:
+            x += dx
+            if blocked(x, y):
+                return None
+            if (x, y) == goal:
+                return (x, y)
+            if (not blocked(x, y + 1) and blocked(x - dx, y + 1)) or \
+               (not blocked(x, y - 1) and blocked(x - dx, y - 1)):
+                return (x, y)
+
+    def jumpVertical(x, y, dy):
+        while True:
+            y += dy
+            if blocked(x, y):
+                return None
+            if (x, y) == goal:
+                return (x, y)
+            if jumpHorizontal(x, y, 1) != None or jumpHorizontal(x, y, -1) != None:
+                return (x, y)
+
+    def directions(state, direction):
+        "the directions worth scanning from a node reached by moving in direction"
+        x, y = state
+        if direction == None:
+            return [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        dx, dy = direction
+        if dy != 0:
+            return [(0, dy), (1, 0), (-1, 0)]
+        scan = [(dx, 0)]
+        for dy in (1, -1):
+            if not blocked(x, y + dy) and blocked(x - dx, y + dy):
+                scan.append((0, dy))
+        return scan
+
+    start = problem.getStartState()
+    "node records are (state, direction it was reached in, cost, parent)"
+    nodes = {start: (start, None, 0, None)}
+    frontier = util.IndexedPriorityQueue()
+    frontier.push(start, heuristic(start, problem))
+    closed = set()
+    while not frontier.isEmpty():
+        node = nodes.pop(frontier.pop())
+        state, direction, cost, _ = node
+        if problem.isGoalState(state):
+            actions = []
+            while node[3] != None:
+                (x, y), (px, py) = node[0], node[3][0]
+                action = Actions.vectorToDirection(node[1])
+                actions.extend([action] * (abs(x - px) + abs(y - py)))
+                node = node[3]
+            actions.reverse()
+            problem._frontierStats = frontier.getStats()
+            return actions
+        closed.add(state)
+        problem.countExpansion(state)
+
+        x, y = state
+        for dx, dy in directions(state, direction):
+            if dy == 0:
+                jumpPoint = jumpHorizontal(x, y, dx)
+            else:
+                jumpPoint = jumpVertical(x, y, dy)
+            if jumpPoint == None or jumpPoint in closed:
+                continue
+            child = (jumpPoint, (dx, dy), cost + abs(jumpPoint[0] - x) + abs(jumpPoint[1] - y), node)
+            if frontier.update(jumpPoint, child[2] + heuristic(jumpPoint, problem)):
+                nodes[jumpPoint] = child
+
+    problem._frontierStats = frontier.getStats()
+    return []
+
+MEMORY_BOUND = 10000
+
+class MemoryBoundedNode:
+    "A search node of memoryBoundedSearch, linked to its parent and its children"
+    def __init__(self, state, action, cost, f, parent):
+        self.state = state
+        self.action = action
+        self.cost = cost
+        self.f = f
+        self.parent = parent
+        self.children = []
+        self.forgotten = {}
+        self.expanded = False
+        if parent == None:
+            self.depth = 0
+        else:
+            self.depth = parent.depth + 1
+
+def memoryBoundedSearch(problem, heuristic=nullHeuristic, budget=MEMORY_BOUND):
+    """
+    A simplified SMA*: A* that never holds more than 'budget' nodes.
+
+    When memory is full the worst leaf (highest f, then shallowest) is dropped.
+    Its parent remembers the f of the dropped child in node.forgotten and goes
+    back on the frontier with the lowest forgotten f, so when it is popped again
+    it regenerates exactly those children.  A dropped path is therefore only
+    searched again once it is the most promising thing left.  f values are made
+    monotone along a path (pathmax), and a state that is already in memory with
+    a cost no higher is not generated twice.
+
+    A node that cannot get children (a dead end, or a path as long as the
+    budget) is forgotten with an infinite f and never regenerated.  If no
+    solution fits in memory, or there is none, [] is returned.  The budget
+    should be comfortably larger than the length of the solution: proving that
+    nothing fits can take time exponential in the budget on open layouts.
+    """
+    infinity = float('inf')
+    start = problem.getStartState()
+    root = MemoryBoundedNode(start, None, 0, heuristic(start, problem), None)
+    frontier = util.IndexedPriorityQueue()
+    frontier.push(root, (root.f, -root.depth))
+    leaves = []
+    leafCount = [0]
+    inMemory = {start: root}
+    used = [1]
+
+    def pushLeaf(node):
+        "remembers a frontier node without children as a candidate to drop"
+        heapq.heappush(leaves, (-node.f, node.depth, leafCount[0], node))
+        leafCount[0] += 1
+
+    def worstLeaf():
+        """
+        The leaf to drop.  The best node on the frontier is only returned when
+        it is the only leaf left, i.e. memory holds nothing but its path.
+        """
+        if frontier.isEmpty():
+            return None
+        best = frontier.peek()
+        skipped = None
+        while leaves:
+            entry = heapq.heappop(leaves)
+            node = entry[-1]
+            if node not in frontier or node.children or node.parent == None or -entry[0] != node.f:
+                continue
+            if node is best and skipped == None:
+                skipped = entry
+                continue
+            if skipped != None:
+                heapq.heappush(leaves, skipped)
+            return node
+        if skipped != None:
+            best.f = infinity
+            return best
+        return None
+
+    def forget(node):
+        "drops a node without children, backing its f up into its parent"
+        frontier.remove(node)
+        if inMemory.get(node.state) is node:
+            del inMemory[node.state]
+        used[0] -= 1
+        parent = node.parent
+        parent.children.remove(node)
+        parent.forgotten[node.state] = node.f
+        parent.f = min(parent.f, node.f)
+        if parent.f < infinity:
+            frontier.update(parent, (parent.f, -parent.depth))
+            if not parent.children:
+                pushLeaf(parent)
+        elif not parent.children and parent.parent != None:
+            forget(parent)
+
+    while not frontier.isEmpty():
+        node = frontier.pop()
+        if problem.isGoalState(node.state):
+            actions = []
+            while node.parent != None:
+                actions.append(node.action)
+                node = node.parent
+            actions.reverse()
+            problem._frontierStats = frontier.getStats()
+            return actions
+
+        nodeF = node.f
+        for succ, action, stepCost in problem.getSuccessors(node.state):
+            if node.expanded:
+                "only regenerate the children that were dropped with a finite f"
+                if node.forgotten.get(succ, infinity) == infinity:
+                    continue
+                childF = node.forgotten.pop(succ)
+            else:
+                childF = nodeF
+            cost = node.cost + stepCost
+            if succ in inMemory and inMemory[succ].cost <= cost:
+                continue
+            if node.depth + 1 >= budget:
+                "the path to this successor would not fit in memory"
+                continue
+            child = MemoryBoundedNode(succ, action, cost, max(childF, cost + heuristic(succ, problem)), node)
+            node.children.append(child)
+            inMemory[succ] = child
+            used[0] += 1
+            frontier.push(child, (child.f, -child.depth))
+            pushLeaf(child)
+        node.expanded = True
+        node.f = min([infinity] + node.forgotten.values())
+
+        if not node.children and node.parent != None:
+            forget(node)
+        elif node.f < infinity:
+            frontier.push(node, (node.f, -node.depth))
+        while used[0] > budget:
+            leaf = worstLeaf()
+            if leaf == None:
+                break
+            forget(leaf)
+
+    problem._frontierStats = frontier.getStats()
+    return []
 
 
 # Abbreviations
@@ -308,6 +609,10 @@ bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
 ucs = uniformCostSearch
+bidi = bidirectionalSearch
+idastar = iterativeDeepeningAStarSearch
+smastar = memoryBoundedSearch
+jps = jumpPointSearch
 
 
 """"
@@ -37,9 +37,14 @@ Good luck and happy searching!
 from game import Directions
 from game import Agent
 from game import Actions
+from game import gridToBitboard
+from game import getMoveTable
 import util
 import time
 import search
+import distanceCalculator
+import searchInstrumentation
+from foodHeuristics import mstFoodHeuristic, farthestPairFoodHeuristic, maxFoodHeuristic, mstCornersHeuristic
 
 class GoWestAgent(Agent):
     "An agent that goes West until it can't."
@@ -68,18 +73,29 @@ class SearchAgent(Agent):
     Options for fn include:
       depthFirstSearch or dfs
       breadthFirstSearch or bfs
-
-
-    Note: You should NOT change any code in SearchAgent
+      bidirectionalSearch or bidi
+      iterativeDeepeningAStarSearch or idastar
+      memoryBoundedSearch or smastar (the node budget is set with budget=N)
+      jumpPointSearch or jps
+
+    The heuristic, for the searches that take one, is named with heuristic=
+    and combined with the search function by withHeuristic; budget=N is
+    passed on to the searches that take a node budget.  With telemetry=FILE
+    the agent also appends one line of JSON per search to FILE ('-' for
+    stdout): the counts and timings of searchInstrumentation.py.  After a
+    search the agent prints the nodes expanded and, for the searches that
+    record them, the frontier statistics.
     """
 
-    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic'):
+    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic', budget=None, telemetry=None):
         # Warning: some advanced Python magic is employed below to find the right functions and problems
 
         # Get the search function from the name and heuristic
         if fn not in dir(search):
             raise AttributeError, fn + ' is not a search function in search.py.'
         func = getattr(search, fn)
+        self.searchName = fn
+        self.heuristic, self.heuristicName, self.budget = None, None, None
         if 'heuristic' not in func.func_code.co_varnames:
             print('[SearchAgent] using function ' + fn)
             self.searchFunction = func
@@ -91,14 +107,25 @@ class SearchAgent(Agent):
             else:
                 raise AttributeError, heuristic + ' is not a function in searchAgents.py or search.py.'
             print('[SearchAgent] using function %s and heuristic %s' % (fn, heuristic))
-            # Note: this bit of Python trickery combines the search algorithm and the heuristic
-            self.searchFunction = lambda x: func(x, heuristic=heur)
+            if budget != None and 'budget' in func.func_code.co_varnames:
+                print('[SearchAgent] using a budget of %s nodes' % budget)
+                self.budget = int(budget)
+            self.heuristic, self.heuristicName = heur, heuristic
+            self.searchFunction = self.withHeuristic(func, heur)
 
         # Get the search problem type from the name
         if prob not in globals().keys() or not prob.endswith('Problem'):
             raise AttributeError, prob + ' is not a search problem type in SearchAgents.py.'
         self.searchType = globals()[prob]
         print('[SearchAgent] using problem type ' + prob)
+        self.telemetry = telemetry
+
+    def withHeuristic(self, func, heuristic):
+        "Combines the search algorithm with the heuristic (and the node budget)"
+        # Note: this bit of Python trickery combines the search algorithm and the heuristic
+        if self.budget != None:
+            return lambda x: func(x, heuristic=heuristic, budget=self.budget)
+        return lambda x: func(x, heuristic=heuristic)
 
     def registerInitialState(self, state):
         """
@@ -112,10 +139,32 @@ class SearchAgent(Agent):
         if self.searchFunction == None: raise Exception, "No search function provided for SearchAgent"
         starttime = time.time()
         problem = self.searchType(state) # Makes a new search problem
-        self.actions  = self.searchFunction(problem) # Find a path
+        searchFunction = self.searchFunction
+        telemetry = 'telemetry' in dir(self) and self.telemetry != None
+        if telemetry:
+            instrument = searchInstrumentation.SearchInstrument()
+            instrument.instrumentProblem(problem)
+            if self.heuristic != None:
+                searchFunction = self.withHeuristic(getattr(search, self.searchName),
+                                                    instrument.instrumentHeuristic(self.heuristic))
+            instrument.start()
+        self.actions  = searchFunction(problem) # Find a path
+        if telemetry:
+            instrument.stop()
         totalCost = problem.getCostOfActions(self.actions)
         print('Path found with total cost of %d in %.1f seconds' % (totalCost, time.time() - starttime))
         if '_expanded' in dir(problem): print('Search nodes expanded: %d' % problem._expanded)
+        if '_frontierStats' in dir(problem) and 'pushes' in problem._frontierStats:
+            stats = problem._frontierStats
+            print('Frontier heap: %d pushes, %d re-pushes, %d stale pops, max size %d' % \
+                  (stats['pushes'], stats['repushes'], stats['stalePops'], stats['maxSize']))
+        if telemetry:
+            record = instrument.getRecord(problem)
+            record.update({'search': self.searchName, 'heuristic': self.heuristicName,
+                           'problem': self.searchType.__name__,
+                           'layout': distanceCalculator.layoutKey(state.getWalls()),
+                           'pathLength': len(self.actions), 'cost': totalCost})
+            searchInstrumentation.writeRecord(record, self.telemetry)
 
     def getAction(self, state):
         """
@@ -153,6 +202,7 @@ class PositionSearchProblem(search.SearchProblem):
         goal: A position in the gameState
         """
         self.walls = gameState.getWalls()
+        self.moves = getMoveTable(self.walls)
         self.startState = gameState.getPacmanPosition()
         if start != None: self.startState = start
         self.goal = goal
@@ -193,14 +243,9 @@ class PositionSearchProblem(search.SearchProblem):
         """
 
         successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextState = (nextx, nexty)
-                cost = self.costFn(nextState)
-                successors.append( ( nextState, action, cost) )
+        for nextState, action in self.moves.getSuccessors(state):
+            cost = self.costFn(nextState)
+            successors.append( ( nextState, action, cost) )
 
         # Bookkeeping for display purposes
         self._expanded += 1 # DO NOT CHANGE
@@ -210,6 +255,10 @@ class PositionSearchProblem(search.SearchProblem):
 
         return successors
 
+    def countExpansion(self, state):
+        "Counts the expansion of state by a search that reads the walls itself (jumpPointSearch)"
+        self._expanded += 1
+
     def getCostOfActions(self, actions):
         """
         Returns the cost of a particular sequence of actions. If those actions
@@ -226,6 +275,38 @@ class PositionSearchProblem(search.SearchProblem):
             cost += self.costFn((x,y))
         return cost
 
+    def getReversedProblem(self):
+        "The same problem searched backwards from the goal (for bidirectional search)"
+        return ReversedPositionSearchProblem(self)
+
+class ReversedPositionSearchProblem(search.SearchProblem):
+    """
+    A PositionSearchProblem seen from its goal: it starts at the goal, its goal
+    is the original start, and the successors of a position are the positions
+    that can step into it.  The action of such a successor is the move from it
+    into the current position and the cost is the cost of entering the current
+    position, so a path found here reads as the end of a forward path of the
+    same cost.  Used by search.bidirectionalSearch.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.startState = problem.goal
+        self.goal = problem.getStartState()
+        self.walls = problem.walls
+        self.costFn = problem.costFn
+
+    def getStartState(self):
+        return self.startState
+
+    def isGoalState(self, state):
+        return state == self.goal
+
+    def getSuccessors(self, state):
+        "Moves are reversible, so the predecessors are the forward successors"
+        cost = self.costFn(state)
+        return [(prev, Directions.REVERSE[action], cost) for prev, action, _ in self.problem.getSuccessors(state)]
+
 class StayEastSearchAgent(SearchAgent):
     """
     An agent for position search with a cost function that penalizes being in
@@ -318,7 +399,8 @@ class CornersProblem(search.SearchProblem):
         #print "STARTING POSITION IS " , self.startingPosition
         initialState = [0,0,0,0] 
         "this decides whether a corner is seen or not: if 0 not seen | if 1 seen"
-        startState = (self.startingPosition, allCorners, initialState) 
+        "the state is made of tuples so it can be hashed into the visited set of the search"
+        startState = (self.startingPosition, tuple(allCorners), tuple(initialState)) 
         return startState
         util.raiseNotDefined()
         #"""
@@ -443,7 +525,7 @@ class CornersProblem(search.SearchProblem):
       		        newFlag[i] = visitedFlag[i]
 
                 #print "newFlag: ",newFlag
-                first = (nextNode, allCorners, newFlag)
+                first = (nextNode, allCorners, tuple(newFlag))
                 result = [first, action, 1]
                 #print "result: ", result
                 successors.append(result)
@@ -619,11 +701,14 @@ class FoodSearchProblem:
 
     A search state in this problem is a tuple ( pacmanPosition, foodGrid ) where
       pacmanPosition: a tuple (x,y) of integers specifying Pacman's position
-      foodGrid:       a Grid (see game.py) of either True or False, specifying remaining food
+      foodGrid:       a Bitboard (see game.py) of the remaining food; it supports
+                      count(), asList() and foodGrid[x][y] like a Grid, and
+                      foodGrid.toGrid() gives the Grid itself
     """
     def __init__(self, startingGameState):
-        self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
+        self.start = (startingGameState.getPacmanPosition(), gridToBitboard(startingGameState.getFood()))
         self.walls = startingGameState.getWalls()
+        self.moves = getMoveTable(self.walls)
         self.startingGameState = startingGameState
         self._expanded = 0 # DO NOT CHANGE
         self.heuristicInfo = {} # A dictionary for the heuristic to store information
@@ -632,20 +717,15 @@ class FoodSearchProblem:
         return self.start
 
     def isGoalState(self, state):
-        return state[1].count() == 0
+        return state[1].isEmpty()
 
     def getSuccessors(self, state):
         "Returns successor states, the actions they require, and a cost of 1."
         successors = []
         self._expanded += 1 # DO NOT CHANGE
-        for direction in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state[0]
-            dx, dy = Actions.directionToVector(direction)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
-                successors.append( ( ((nextx, nexty), nextFood), direction, 1) )
+        for (nextx, nexty), direction in self.moves.getSuccessors(state[0]):
+            nextFood = state[1].eat(nextx, nexty)
+            successors.append( ( ((nextx, nexty), nextFood), direction, 1) )
         return successors
 
     def getCostOfActions(self, actions):
@@ -683,9 +763,9 @@ def foodHeuristic(state, problem):
     other hand, inadmissible or inconsistent heuristics may find optimal
     solutions, so be careful.
 
-    The state is a tuple ( pacmanPosition, foodGrid ) where foodGrid is a Grid
-    (see game.py) of either True or False. You can call foodGrid.asList() to get
-    a list of food coordinates instead.
+    The state is a tuple ( pacmanPosition, foodGrid ) where foodGrid is a
+    Bitboard (see game.py) of the remaining food. You can call foodGrid.asList()
+    to get a list of food coordinates instead.
 
     If you want access to info like walls, capsules, etc., you can query the
     problem.  For example, problem.walls gives you a Grid of where the walls
@@ -748,6 +828,11 @@ def foodHeuristic(state, problem):
     """
     foodGridList = foodGrid.asList()
     huristicReturn = 0
+
+    "the maze distances of this layout are looked up once and kept with the problem"
+    if 'distancer' not in problem.heuristicInfo:
+        problem.heuristicInfo['distancer'] = distanceCalculator.getDistancer(problem.walls)
+    distancer = problem.heuristicInfo['distancer']
     
     "if all the food is eaten then the food list should be empty. if empty return the huristic"
     if len( foodGridList) == 0:
@@ -760,7 +845,7 @@ def foodHeuristic(state, problem):
         outputManhattan = []
         for foodNode in foodGridList:
             #distanceLocal = util.manhattanDistance(position ,foodNode)
-            distanceLocal = mazeDistance(position ,foodNode, problem.startingGameState)
+            distanceLocal = distancer.getDistance(position ,foodNode)
         
             b  = [distanceLocal, foodNode]
             outputManhattan.append(b)
@@ -781,100 +866,81 @@ def foodHeuristic(state, problem):
     #return 0
 
 class ClosestDotSearchAgent(SearchAgent):
-    "Search for all food using a sequence of searches"
+    """
+    Search for all food using a sequence of searches.
+
+    By default the agent plans incrementally: it keeps a NearestFoodField
+    (distanceCalculator.py) of the distance from every cell to the closest
+    remaining dot, so each next path is read off the field and only the part of
+    the field around an eaten dot is recomputed.  With incremental=False every
+    path is a fresh breadth first search on an AnyFoodSearchProblem:
+
+    > python pacman.py -l bigSearch -p ClosestDotSearchAgent -a incremental=False
+    """
+    def __init__(self, incremental=True, **args):
+        SearchAgent.__init__(self, **args)
+        self.incremental = str(incremental) != 'False'
+        self.foodField = None
+
     def registerInitialState(self, state):
         self.actions = []
-        currentState = state
-        while(currentState.getFood().count() > 0):
-            nextPathSegment = self.findPathToClosestDot(currentState) # The missing piece
-            self.actions += nextPathSegment
-            for action in nextPathSegment:
-                legal = currentState.getLegalActions()
-                if action not in legal:
-                    t = (str(action), str(currentState))
-                    raise Exception, 'findPathToClosestDot returned an illegal move: %s!\n%s' % t
-                currentState = currentState.generateSuccessor(0, action)
+        if self.incremental:
+            self.actions = self.planIncrementally(state)
+        else:
+            currentState = state
+            while(currentState.getFood().count() > 0):
+                nextPathSegment = self.findPathToClosestDot(currentState) # The missing piece
+                self.actions += nextPathSegment
+                for action in nextPathSegment:
+                    legal = currentState.getLegalActions()
+                    if action not in legal:
+                        t = (str(action), str(currentState))
+                        raise Exception, 'findPathToClosestDot returned an illegal move: %s!\n%s' % t
+                    currentState = currentState.generateSuccessor(0, action)
         self.actionIndex = 0
         print 'Path found with cost %d.' % len(self.actions)
 
+    def planIncrementally(self, state):
+        """
+        Returns the actions that eat all the food, always going for the
+        closest dot, while keeping self.foodField in step with the food left.
+        """
+        self.foodField = distanceCalculator.NearestFoodField(state.getWalls(), state.getFood())
+        position = state.getPacmanPosition()
+        actions = []
+        try:
+            while True:
+                path = self.foodField.pathToNearest(position)
+                if len(path) == 0:
+                    return actions
+                actions += cellsToActions(position, path)
+                position = path[-1]
+                self.foodField.removeFood(position)
+        finally:
+            self.foodField = None
+
     def findPathToClosestDot(self, gameState):
         """
         Returns a path (a list of actions) to the closest dot, starting from
         gameState.
         """
-        # Here are some useful elements of the startState
         startPosition = gameState.getPacmanPosition()
-        #food = gameState.getFood()
-        #walls = gameState.getWalls()
-        problem = AnyFoodSearchProblem(gameState)
-
-        "*** YOUR CODE HERE ***"
-        
-        """ FUNCTIONALITY DESCRIPTION
-        all the problem is designed in the above. Knowing the probelm I can take 
-        the path using any algorithm and return the path. This process is 
-        repeated until goal is met which is all dots are eaten. but for every iteration 
-        there is a goal which is the closest one and this goal is satisfied once the 
-        closest food is eaten. but this process also repaest until all foods also 
-        eaten too. Any algorithm can be used,here but a BFS or a UCS would be the best. 
-        The following implementation is BFS 
-        """
-        
-        frontierPath = util.Queue()
-        firstElem = [(problem.getStartState(), "NA")]
-        frontierPath.push(firstElem)
-        visited = []
-        node = [] 
-        
-        while True is True:
-            "pop value from the frontierPath and put in node" 
-            node = frontierPath.pop()
-            lenNode = len(node)
-  	    lastNode = node[len(node)-1]
-  	    "this is the last node on the list, which will be used for to find sucessors"
-  	    lastNodeXY = lastNode[0]
-  	
-     	    returnVal = []
-  	    for i in range(1,lenNode):
-  	        "this loop always keeps the return direction updated to the latest path by taking the values form node and updaing"
-  	        nodeXY = node[i]
-  	        returnVal.append(nodeXY[1])
-      	    
-  	    
-            if problem.isGoalState(lastNodeXY) is True:
-                "if this is the goal, return the value "
-  	        return returnVal
-
- 	    if lastNodeXY in visited:
-                "if lastNodeXY is among the visited then do nothing, it is already visited. This is to avoid redundancy "
- 	        #print " XY IS ALREADY IN VISITED LIST! "
- 	        pass
-  	    else:
-                "if lastNodeXY is NOT (else) among the visited, then append the node to teh visited and get all sucessor for that point" 
-                "since we took the node as a valid sucessor and we are going to add to the frontierPath then it is visited. This is to avoid reaching to the same sucessor and putting it into stack"
-                visited.append(lastNodeXY)
-            
-                "here is the list of new sucessors"
-  	        newSucessors = problem.getSuccessors(lastNodeXY)
-  	        for ii in range(0, len(newSucessors)):
-  	            succ = newSucessors[ii]
-  	            "if the first value which is the next sucessor is in the visited list then skip"
-  	            if succ[0] in visited:
-  	                "if sucsessor is in the visited list then do nothing. this is to avoid redundancy"
-  	                #print " SUCCESSOR ALREADY ADDED! "
-  	                pass
-  	             
-  	            else :
-  	                "if sucsessor is not in the visited list then a new path(newSuccPath) has to be made for it by taking all nodes of the path and appending the new node. the reason for a new success path is to avoid messing up the path for next sucessor. each time loop is implemented a new set of newSuccPath is made which will be use exclusively for that path "
-  	                newSuccPath = []
-  	                for i in range(0,len(node)):
-  	                    newSuccPath.append(node[i])
-  	                
-  	                newSuccPath.append(succ)
-  	                "depending on the input number different data structure will be implemented"
-  	                frontierPath.push(newSuccPath)
+        if self.incremental:
+            field = self.foodField
+            if field == None:
+                field = distanceCalculator.NearestFoodField(gameState.getWalls(), gameState.getFood())
+            return cellsToActions(startPosition, field.pathToNearest(startPosition))
 
+        problem = AnyFoodSearchProblem(gameState)
+        return search.breadthFirstSearch(problem)
 
+def cellsToActions(start, cells):
+    "The actions that walk from start along a list of adjacent cells"
+    actions = []
+    for cell in cells:
+        actions.append(Actions.vectorToDirection((cell[0] - start[0], cell[1] - start[1])))
+        start = cell
+    return actions
 
 class AnyFoodSearchProblem(PositionSearchProblem):
     """
@@ -898,6 +964,7 @@ class AnyFoodSearchProblem(PositionSearchProblem):
 
         # Store info for the PositionSearchProblem (no need to change this)
         self.walls = gameState.getWalls()
+        self.moves = getMoveTable(self.walls)
         self.startState = gameState.getPacmanPosition()
         self.costFn = lambda x: 1
         self._visited, self._visitedlist, self._expanded = {}, [], 0 # DO NOT CHANGE
@@ -942,11 +1009,13 @@ def mazeDistance(point1, point2, gameState):
     Example usage: mazeDistance( (2,4), (5,6), gameState)
 
     This might be a useful helper function for your ApproximateSearchAgent.
+
+    The distances of the whole maze are computed once per layout and cached
+    (see distanceCalculator.py), so every call after the first is a lookup.
     """
     x1, y1 = point1
     x2, y2 = point2
     walls = gameState.getWalls()
     assert not walls[x1][y1], 'point1 is a wall: ' + str(point1)
     assert not walls[x2][y2], 'point2 is a wall: ' + str(point2)
-    prob = PositionSearchProblem(gameState, start=point1, goal=point2, warn=False, visualize=False)
-    return len(search.bfs(prob))
+    return distanceCalculator.getDistancer(walls).getDistance(point1, point2)
@@ -0,0 +1,184 @@
+# searchBenchmark.py
+# ------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Headless benchmarks for the search code.  Every run builds the search problem
+from a layout, solves it and prints one row with the path cost, the number of
+expanded nodes and the wall-clock time.  A run that expands more than the node
+budget is stopped and reported as such, so hopeless combinations (A* on the
+whole of bigSearch with a weak heuristic) do not hang the benchmark.
+
+  python searchBenchmark.py food -l trickySearch,mediumSearch,bigSearch
+  python searchBenchmark.py food -H mstFoodHeuristic,maxFoodHeuristic -b 200000
+  python searchBenchmark.py position -l openMaze
+  python searchBenchmark.py telemetry -l openMaze -H bidirectionalSearch
+"""
+
+import sys
+import time
+import layout
+import pacman
+import search
+import searchAgents
+import searchInstrumentation
+
+class BudgetExceeded(Exception):
+    pass
+
+def limitExpansions(problem, budget):
+    """
+    Makes problem.getSuccessors, and problem.countExpansion for the searches
+    that expand nodes without it, raise BudgetExceeded after 'budget'
+    expansions
+    """
+    def limited(expand):
+        def limitedExpand(state):
+            if problem._expanded >= budget:
+                raise BudgetExceeded()
+            return expand(state)
+        return limitedExpand
+    problem.getSuccessors = limited(problem.getSuccessors)
+    if 'countExpansion' in dir(problem):
+        problem.countExpansion = limited(problem.countExpansion)
+    return problem
+
+def loadGameState(layoutName):
+    lay = layout.getLayout(layoutName)
+    if lay == None: raise Exception("The layout " + layoutName + " cannot be found")
+    gameState = pacman.GameState()
+    gameState.initialize(lay, 0)
+    return gameState
+
+def runSearch(problem, searchFn, budget):
+    """
+    Returns (cost, expanded, seconds) for one search; cost is None when the
+    node budget ran out before a path was found.
+    """
+    limitExpansions(problem, budget)
+    start = time.time()
+    try:
+        path = searchFn(problem)
+        cost = problem.getCostOfActions(path)
+    except BudgetExceeded:
+        cost = None
+    return cost, problem._expanded, time.time() - start
+
+def printRow(columns, widths):
+    print('  '.join([str(column).ljust(width) for column, width in zip(columns, widths)]))
+
+def benchmarkFoodHeuristics(layoutNames, heuristicNames, budget):
+    "Runs A* with every food heuristic on every layout"
+    widths = [16, 28, 8, 10, 8]
+    printRow(['layout', 'heuristic', 'cost', 'expanded', 'seconds'], widths)
+    for layoutName in layoutNames:
+        gameState = loadGameState(layoutName)
+        for heuristicName in heuristicNames:
+            heuristic = getattr(searchAgents, heuristicName)
+            problem = searchAgents.FoodSearchProblem(gameState)
+            cost, expanded, seconds = runSearch(problem, lambda p: search.astar(p, heuristic), budget)
+            if cost == None: cost = 'budget'
+            printRow([layoutName, heuristicName, cost, expanded, '%.3f' % seconds], widths)
+
+def benchmarkPositionSearch(layoutNames, searchNames, budget):
+    """
+    Runs every search function on the PositionSearchProblem of every layout.
+    A search is given as a function name from search.py, optionally followed by
+    ':' and a heuristic from searchAgents.py, e.g. bidirectionalSearch:manhattanHeuristic
+    """
+    widths = [16, 40, 8, 10, 8]
+    printRow(['layout', 'search', 'cost', 'expanded', 'seconds'], widths)
+    for layoutName in layoutNames:
+        gameState = loadGameState(layoutName)
+        for searchName in searchNames:
+            searchFn = getattr(search, searchName.split(':')[0])
+            if ':' in searchName:
+                heuristic = getattr(searchAgents, searchName.split(':')[1])
+                searchFn = lambda p, searchFn=searchFn, heuristic=heuristic: searchFn(p, heuristic)
+            problem = searchAgents.PositionSearchProblem(gameState, warn=False, visualize=False)
+            cost, expanded, seconds = runSearch(problem, searchFn, budget)
+            if cost == None: cost = 'budget'
+            printRow([layoutName, searchName, cost, expanded, '%.3f' % seconds], widths)
+
+def checkTelemetry(layoutNames, searchNames, budget):
+    """
+    Runs every search (named as for benchmarkPositionSearch) on the
+    PositionSearchProblem of every layout twice, as SearchAgent does without
+    and with telemetry, and checks that the counting wrappers leave the
+    search unchanged: the same cost and the same number of expanded nodes.
+    """
+    widths = [16, 40, 8, 10, 10, 6]
+    printRow(['layout', 'search', 'cost', 'expanded', 'measured', 'same'], widths)
+    mismatches = 0
+    for layoutName in layoutNames:
+        gameState = loadGameState(layoutName)
+        for searchName in searchNames:
+            searchFn = getattr(search, searchName.split(':')[0])
+            heuristic = search.nullHeuristic
+            if ':' in searchName:
+                heuristic = getattr(searchAgents, searchName.split(':')[1])
+            results = []
+            for measured in (False, True):
+                problem = searchAgents.PositionSearchProblem(gameState, warn=False, visualize=False)
+                h = heuristic
+                if measured:
+                    instrument = searchInstrumentation.SearchInstrument()
+                    instrument.instrumentProblem(problem)
+                    h = instrument.instrumentHeuristic(heuristic)
+                if 'heuristic' in searchFn.func_code.co_varnames:
+                    results.append(runSearch(problem, lambda p: searchFn(p, heuristic=h), budget))
+                else:
+                    results.append(runSearch(problem, searchFn, budget))
+            (cost, expanded, seconds), (measuredCost, measuredExpanded, seconds) = results
+            same = cost == measuredCost and expanded == measuredExpanded
+            if not same: mismatches += 1
+            printRow([layoutName, searchName, cost, expanded, measuredExpanded, same], widths)
+    if mismatches > 0:
+        raise Exception('%d searches changed under telemetry' % mismatches)
+
+BENCHMARKS = {
+    'food': (benchmarkFoodHeuristics, 'trickySearch,mediumSearch,bigSearch',
+             'foodHeuristic,farthestPairFoodHeuristic,mstFoodHeuristic,maxFoodHeuristic'),
+    'position': (benchmarkPositionSearch, 'mediumMaze,bigMaze,openMaze,openSearch,bigSearch',
+                 'breadthFirstSearch,uniformCostSearch,bidirectionalSearch,'
+                 'aStarSearch:manhattanHeuristic,bidirectionalSearch:manhattanHeuristic,'
+                 'jumpPointSearch:manhattanHeuristic'),
+    'telemetry': (checkTelemetry, 'mediumMaze,openMaze',
+                  'breadthFirstSearch,uniformCostSearch,bidirectionalSearch,'
+                  'aStarSearch:manhattanHeuristic,bidirectionalSearch:manhattanHeuristic'),
+}
+
+def readCommand(argv):
+    from optparse import OptionParser
+    usageStr = """
+    USAGE:      python searchBenchmark.py <benchmark> <options>
+    BENCHMARKS: %s
+    """ % ', '.join(sorted(BENCHMARKS.keys()))
+    parser = OptionParser(usageStr)
+    parser.add_option('-l', '--layouts', dest='layouts', default=None,
+                      help='comma separated LAYOUTS to run on (default depends on the benchmark)')
+    parser.add_option('-H', '--heuristics', dest='heuristics', default=None,
+                      help='comma separated heuristics or search functions to compare')
+    parser.add_option('-b', '--budget', dest='budget', type='int', default=20000,
+                      help='stop a run after this many expanded nodes [Default: %default]')
+    options, args = parser.parse_args(argv)
+    if len(args) != 1 or args[0] not in BENCHMARKS:
+        parser.error('choose one benchmark out of: ' + ', '.join(sorted(BENCHMARKS.keys())))
+    return args[0], options
+
+if __name__ == '__main__':
+    name, options = readCommand(sys.argv[1:])
+    benchmarkFn, defaultLayouts, defaultHeuristics = BENCHMARKS[name]
+    layouts = (options.layouts or defaultLayouts).split(',')
+    heuristics = (options.heuristics or defaultHeuristics).split(',')
+    benchmarkFn(layouts, heuristics, options.budget)
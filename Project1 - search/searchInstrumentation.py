@@ -0,0 +1,132 @@
+# searchInstrumentation.py
+# ------------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Telemetry for one run of a search function.  A SearchInstrument wraps the
+getSuccessors method of a search problem and the heuristic, so it can count
+and time them without any change to the search code, and reads the rest
+(problem._expanded, the peak frontier size in problem._frontierStats) off the
+problem when the search is over.  The result is one flat dictionary, written as
+a line of JSON so runs can be collected in a file and compared later.
+
+SearchAgent does this when it is given a telemetry file ('-' for stdout):
+
+> python pacman.py -l bigMaze -p SearchAgent -a fn=astar,heuristic=manhattanHeuristic,telemetry=runs.jsonl -q
+"""
+
+import json
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def peakMemory():
+    """
+    The peak resident memory of this process (kilobytes on Linux, bytes on
+    Mac OS), or None where the resource module is not available.
+    """
+    if resource == None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+class SearchInstrument:
+    """
+    Counts and times the successor and heuristic calls of one search.  Use it
+    as:
+
+      instrument = SearchInstrument()
+      instrument.instrumentProblem(problem)
+      heuristic = instrument.instrumentHeuristic(heuristic)
+      instrument.start()
+      actions = search.aStarSearch(problem, heuristic)
+      instrument.stop()
+      record = instrument.getRecord(problem)
+    """
+    def __init__(self):
+        self.successorCalls = 0
+        self.successorSeconds = 0.0
+        self.heuristicCalls = 0
+        self.heuristicSeconds = 0.0
+        self.startTime = self.stopTime = None
+        self.startMemory = self.stopMemory = None
+
+    def instrumentProblem(self, problem):
+        "Replaces problem.getSuccessors by a counted and timed version"
+        getSuccessors = problem.getSuccessors
+        def instrumentedGetSuccessors(state):
+            self.successorCalls += 1
+            start = time.time()
+            try:
+                return getSuccessors(state)
+            finally:
+                self.successorSeconds += time.time() - start
+        problem.getSuccessors = instrumentedGetSuccessors
+        return problem
+
+    def instrumentHeuristic(self, heuristic):
+        "Returns a counted and timed version of heuristic"
+        def instrumentedHeuristic(state, problem=None):
+            self.heuristicCalls += 1
+            start = time.time()
+            try:
+                return heuristic(state, problem)
+            finally:
+                self.heuristicSeconds += time.time() - start
+        # searches that treat nullHeuristic specially still recognise it
+        instrumentedHeuristic.__wrapped__ = heuristic
+        return instrumentedHeuristic
+
+    def start(self):
+        self.startMemory = peakMemory()
+        self.startTime = time.time()
+
+    def stop(self):
+        self.stopTime = time.time()
+        self.stopMemory = peakMemory()
+
+    def getRecord(self, problem):
+        "The measurements of the run as a dictionary"
+        record = {
+            'expanded': None,
+            'successorCalls': self.successorCalls,
+            'peakFrontier': None,
+            'heuristicCalls': self.heuristicCalls,
+            'heuristicSeconds': round(self.heuristicSeconds, 6),
+            'successorSeconds': round(self.successorSeconds, 6),
+            'totalSeconds': round(self.stopTime - self.startTime, 6),
+            'peakMemory': self.stopMemory,
+            'memoryGrowth': None,
+        }
+        if '_expanded' in dir(problem):
+            record['expanded'] = problem._expanded
+        if '_frontierStats' in dir(problem):
+            record['peakFrontier'] = problem._frontierStats.get('peakSize')
+        if self.startMemory != None:
+            record['memoryGrowth'] = self.stopMemory - self.startMemory
+        return record
+
+def writeRecord(record, path):
+    "Appends record to the file at path as one line of JSON; '-' is stdout"
+    line = json.dumps(record, sort_keys=True)
+    if path == '-':
+        sys.stdout.write(line + '\n')
+        return
+    f = open(path, 'a')
+    try:
+        f.write(line + '\n')
+    finally:
+        f.close()
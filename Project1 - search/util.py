@@ -16,6 +16,7 @@ import sys
 import inspect
 import heapq, random
 import cStringIO
+import collections
 
 
 class FixedRandom:
@@ -137,11 +138,11 @@ class Stack:
 class Queue:
     "A container with a first-in-first-out (FIFO) queuing policy."
     def __init__(self):
-        self.list = []
+        self.list = collections.deque()
 
     def push(self,item):
         "Enqueue the 'item' into the queue"
-        self.list.insert(0,item)
+        self.list.appendleft(item)
 
     def pop(self):
         """
@@ -185,6 +186,94 @@ class PriorityQueue:
     def isEmpty(self):
         return len(self.heap) == 0
 
+class IndexedPriorityQueue(PriorityQueue):
+    """
+      A PriorityQueue that holds every item at most once.  Calling
+      update(item, priority) on an item that is already queued lowers its
+      priority instead of inserting a second copy; the old heap entry is
+      marked stale and thrown away when it reaches the top of the heap
+      (lazy deletion).  Items must therefore be hashable.
+
+      The queue counts its heap traffic so that callers can report it:
+        pushes    - entries put on the heap
+        repushes  - updates that lowered the priority of a queued item
+        stalePops - stale entries discarded by pop
+        maxSize   - the largest size the heap reached
+        peakSize  - the largest number of items queued at once
+    """
+    def  __init__(self):
+        PriorityQueue.__init__(self)
+        self.entries = {}
+        self.pushes = 0
+        self.repushes = 0
+        self.stalePops = 0
+        self.maxSize = 0
+        self.peakSize = 0
+
+    def push(self, item, priority):
+        "Queues 'item' with 'priority', replacing any entry it already has"
+        if item in self.entries:
+            self.entries[item][-1] = False
+        entry = [priority, self.count, item, True]
+        self.entries[item] = entry
+        heapq.heappush(self.heap, entry)
+        self.count += 1
+        self.pushes += 1
+        if len(self.heap) > self.maxSize:
+            self.maxSize = len(self.heap)
+        if len(self.entries) > self.peakSize:
+            self.peakSize = len(self.entries)
+
+    def update(self, item, priority):
+        """
+          Queues 'item' if it is not in the queue, or lowers its priority if
+          it is queued with a higher one.  Returns True if the item was
+          (re)queued and False if it already had an equal or lower priority.
+        """
+        if item in self.entries:
+            if self.entries[item][0] <= priority:
+                return False
+            self.repushes += 1
+        self.push(item, priority)
+        return True
+
+    def pop(self):
+        while True:
+            (_, _, item, alive) = heapq.heappop(self.heap)
+            if alive:
+                del self.entries[item]
+                return item
+            self.stalePops += 1
+
+    def remove(self, item):
+        "Takes 'item' out of the queue if it is queued"
+        if item in self.entries:
+            self.entries.pop(item)[-1] = False
+
+    def peek(self):
+        "Returns the item with the lowest priority without removing it"
+        self.peekPriority()
+        return self.heap[0][2]
+
+    def __contains__(self, item):
+        return item in self.entries
+
+    def peekPriority(self):
+        "Returns the lowest priority in the queue without removing its item"
+        while not self.heap[0][-1]:
+            heapq.heappop(self.heap)
+            self.stalePops += 1
+        return self.heap[0][0]
+
+    def isEmpty(self):
+        return len(self.entries) == 0
+
+    def getStats(self):
+        "Returns the heap traffic counters as a dictionary"
+        return {'pushes': self.pushes, 'repushes': self.repushes,
+                'stalePops': self.stalePops, 'maxSize': self.maxSize,
+                'peakSize': self.peakSize}
+
 class PriorityQueueWithFunction(PriorityQueue):
     """
     Implements a priority queue with the same push/pop signature of the
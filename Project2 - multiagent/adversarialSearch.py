@@ -0,0 +1,496 @@
+# adversarialSearch.py
+# --------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+The game tree search engine behind the adversarial agents of multiAgents.py.
+
+Pacman (agent 0) maximizes and every ghost minimizes, in turn.  A depth of d
+means d moves by every agent, as in the MultiAgentSearchAgent classes, and the
+evaluation function is called on the states where the depth runs out or the
+game is over.
+
+AlphaBetaSearch can run as plain alpha-beta, visiting the actions in the order
+getLegalActions returns them and pruning only on strict inequality (what the
+autograder expects), or with its enhancements switched on:
+
+  ordering        the best action stored for a state is tried first, then the
+                  killer actions that caused a cutoff at the same ply, then
+                  the rest by their history score (how much deep cutoffs they
+                  have caused so far)
+  transpositions  values are kept in a table keyed by (GameState, agent), so
+                  a state reached through different move orders is searched
+                  once, and the bounds of earlier iterations narrow the window
+
+iterativeDeepening searches depth 1, 2, ... until the maximum depth or the
+deadline and returns the result of the deepest search that finished.
+
+ExpectimaxSearch treats the ghosts as chance nodes instead.  It can weigh the
+ghost actions by a model of the ghosts (uniform, or e.g. the distribution of
+DirectionalGhost), average over a few sampled ghost actions instead of all of
+them, and remember the value of every chance node it has searched during the
+current move, since the same state is reached through many move orders.
+
+MonteCarloTreeSearch is an anytime alternative: it plays simulated games
+until its time runs out and picks the action that was explored most, so the
+quality of the move grows with the time it is given rather than with a depth.
+
+All three engines take fastSuccessors: the successors are then made with
+GameState.generateSuccessorFast, which skips the legality check and most of
+the copying.  It is off for the autograded agents: the autograder switches
+on GameState.trackExploration and counts the states generateSuccessor makes.
+AlphaBetaSearch and ExpectimaxSearch also take inPlace: the search then walks
+a single SearchState (searchState.py) with makeMove and unmakeMove and builds
+no new states at all; its tables are keyed by SearchState.key().
+"""
+
+import math
+import random
+import time
+import util
+import searchState
+from game import Actions, Directions
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+def successor(state, agent, action, fast):
+    "generateSuccessorFast if fast, otherwise generateSuccessor"
+    if fast:
+        return state.generateSuccessorFast(agent, action)
+    return state.generateSuccessor(agent, action)
+
+def descend(state, agent, action, fast, inPlace):
+    """
+    The state after agent takes action and the undo record that ascend needs
+    to get back; with inPlace, state is a SearchState and is changed itself.
+    """
+    if inPlace:
+        return state, state.makeMove(agent, action)
+    return successor(state, agent, action, fast), None
+
+def ascend(state, undo):
+    "Returns from the state descend made"
+    if undo != None:
+        state.unmakeMove(undo)
+
+class SearchTimeout(Exception):
+    "Raised inside a search that runs past its deadline"
+    pass
+
+class AlphaBetaSearch:
+    """
+    Depth limited alpha-beta search over GameStates.  The transposition table
+    and the killer actions only make sense for one root state and are cleared
+    by every call to search or iterativeDeepening with a new root; the history
+    scores carry over to the next move, halved.
+    """
+    def __init__(self, evaluationFunction, ordering=False, transpositions=False, fastSuccessors=False,
+                 inPlace=False):
+        self.evaluationFunction = evaluationFunction
+        self.fastSuccessors = fastSuccessors
+        self.inPlace = inPlace
+        self.ordering = ordering
+        self.transpositions = transpositions
+        self.history = {}
+        self.killers = {}
+        self.table = {}
+        self.root = None
+        self.deadline = None
+        self.nodes = 0
+
+    def newRoot(self, gameState):
+        "Forgets everything that was specific to the previous root state"
+        if self.root is gameState:
+            return
+        self.root = gameState
+        self.table = {}
+        self.killers = {}
+        for key in self.history:
+            self.history[key] /= 2
+        self.nodes = 0
+
+    def search(self, gameState, depth, deadline=None):
+        """
+        Returns (value, action) for Pacman at gameState, searched to depth.
+        Raises SearchTimeout if time.time() passes deadline before it is done.
+        """
+        self.newRoot(gameState)
+        self.numAgents = gameState.getNumAgents()
+        self.deadline = deadline
+        if self.inPlace:
+            gameState = searchState.SearchState(gameState)
+        return self.alphaBeta(gameState, 0, depth * self.numAgents, 0, -float('inf'), float('inf'))
+
+    def iterativeDeepening(self, gameState, maxDepth, timeLimit=None):
+        """
+        Returns (value, action, depth) of the deepest search that finished
+        within timeLimit seconds.  Depth 1 is always searched to the end, so
+        there is an action even when the time is too short for anything else.
+        """
+        deadline = None
+        if timeLimit != None:
+            deadline = time.time() + timeLimit
+        value, action = self.search(gameState, 1)
+        completed = 1
+        for depth in range(2, maxDepth + 1):
+            try:
+                value, action = self.search(gameState, depth, deadline)
+            except SearchTimeout:
+                break
+            completed = depth
+        return value, action, completed
+
+    def alphaBeta(self, state, agent, plies, ply, alpha, beta):
+        """
+        The value of state with agent to move and 'plies' single agent moves
+        left, together with the action that achieves it.
+        """
+        if plies == 0 or state.isWin() or state.isLose():
+            return self.evaluationFunction(state), None
+        if self.deadline != None and time.time() > self.deadline:
+            raise SearchTimeout()
+        self.nodes += 1
+
+        if self.inPlace:
+            key = (state.key(), agent)
+        else:
+            key = (state, agent)
+        bestGuess = None
+        if self.transpositions and key in self.table:
+            entryPlies, value, bound, action = self.table[key]
+            if entryPlies >= plies:
+                if bound == EXACT:
+                    return value, action
+                if bound == LOWER and value > alpha:
+                    alpha = value
+                elif bound == UPPER and value < beta:
+                    beta = value
+                if alpha >= beta:
+                    return value, action
+            bestGuess = action
+        windowAlpha, windowBeta = alpha, beta
+
+        actions = state.getLegalActions(agent)
+        if self.ordering:
+            actions = self.orderActions(actions, agent, ply, bestGuess)
+        nextAgent = (agent + 1) % self.numAgents
+
+        bestAction = None
+        if agent == 0:
+            bestValue = -float('inf')
+            for action in actions:
+                child, undo = descend(state, agent, action, self.fastSuccessors, self.inPlace)
+                value = self.alphaBeta(child, nextAgent, plies - 1, ply + 1, alpha, beta)[0]
+                ascend(child, undo)
+                if value > bestValue:
+                    bestValue, bestAction = value, action
+                if bestValue > beta:
+                    self.recordCutoff(agent, action, ply, plies)
+                    break
+                alpha = max(alpha, bestValue)
+        else:
+            bestValue = float('inf')
+            for action in actions:
+                child, undo = descend(state, agent, action, self.fastSuccessors, self.inPlace)
+                value = self.alphaBeta(child, nextAgent, plies - 1, ply + 1, alpha, beta)[0]
+                ascend(child, undo)
+                if value < bestValue:
+                    bestValue, bestAction = value, action
+                if bestValue < alpha:
+                    self.recordCutoff(agent, action, ply, plies)
+                    break
+                beta = min(beta, bestValue)
+
+        if self.transpositions:
+            if bestValue <= windowAlpha:
+                bound = UPPER
+            elif bestValue >= windowBeta:
+                bound = LOWER
+            else:
+                bound = EXACT
+            self.table[key] = (plies, bestValue, bound, bestAction)
+        return bestValue, bestAction
+
+    def orderActions(self, actions, agent, ply, bestGuess):
+        "Sorts actions: the stored best action, then killers, then by history"
+        killers = self.killers.get(ply, [])
+        def rank(action):
+            if action == bestGuess:
+                return (0, 0)
+            if action in killers:
+                return (1, killers.index(action))
+            return (2, -self.history.get((agent, action), 0))
+        return sorted(actions, key=rank)
+
+    def recordCutoff(self, agent, action, ply, plies):
+        "Remembers an action that caused a cutoff as a killer and in the history"
+        if self.ordering:
+            killers = self.killers.setdefault(ply, [])
+            if action not in killers:
+                killers.insert(0, action)
+                del killers[2:]
+            self.history[(agent, action)] = self.history.get((agent, action), 0) + plies * plies
+
+def uniformDistribution(state, agent):
+    "Every legal action of the agent is equally likely"
+    actions = state.getLegalActions(agent)
+    return [(action, 1.0 / len(actions)) for action in actions]
+
+class ExpectimaxSearch:
+    """
+    Depth limited expectimax over GameStates.
+
+    ghostDistribution(state, agent) returns the (action, probability) pairs of
+    a ghost.  With samples=k, a chance node with more than k actions draws k
+    actions from that distribution (with replacement) and averages over them;
+    samples=None averages over every action.  With memoize, chance node values
+    are cached by (GameState, agent, plies left) until the next root state.
+    batchEvaluation, if given, scores a list of states with the same values
+    as evaluationFunction; the children of a node one ply above the leaves
+    are then evaluated with a single call.
+    """
+    def __init__(self, evaluationFunction, ghostDistribution=uniformDistribution, samples=None, memoize=False,
+                 fastSuccessors=False, inPlace=False, batchEvaluation=None):
+        self.evaluationFunction = evaluationFunction
+        self.batchEvaluation = batchEvaluation
+        self.fastSuccessors = fastSuccessors
+        self.inPlace = inPlace
+        self.ghostDistribution = ghostDistribution
+        self.samples = samples
+        self.memoize = memoize
+        self.cache = {}
+        self.nodes = 0
+
+    def search(self, gameState, depth):
+        "Returns (value, action) for Pacman at gameState, searched to depth"
+        self.cache = {}
+        self.nodes = 0
+        self.numAgents = gameState.getNumAgents()
+        if self.inPlace:
+            gameState = searchState.SearchState(gameState)
+        return self.expectimax(gameState, 0, depth * self.numAgents)
+
+    def expectimax(self, state, agent, plies):
+        """
+        The expected value of state with agent to move and 'plies' single
+        agent moves left, together with Pacman's best action when agent is 0.
+        """
+        if plies == 0 or state.isWin() or state.isLose():
+            return self.evaluationFunction(state), None
+
+        if agent == 0:
+            self.nodes += 1
+            bestValue, bestAction = -float('inf'), None
+            actions = state.getLegalActions(agent)
+            for action, value in zip(actions, self.childValues(state, agent, actions, plies)):
+                if value > bestValue:
+                    bestValue, bestAction = value, action
+            return bestValue, bestAction
+
+        if self.inPlace:
+            key = (state.key(), agent, plies)
+        else:
+            key = (state, agent, plies)
+        if self.memoize and key in self.cache:
+            return self.cache[key], None
+        self.nodes += 1
+        value = 0.0
+        outcomes = self.chanceOutcomes(state, agent)
+        childValues = self.childValues(state, agent, [action for action, probability in outcomes], plies)
+        for (action, probability), childValue in zip(outcomes, childValues):
+            value += probability * childValue
+        if self.memoize:
+            self.cache[key] = value
+        return value, None
+
+    def childValues(self, state, agent, actions, plies):
+        "The values of the states after each of actions by agent"
+        if plies == 1 and self.batchEvaluation != None:
+            parent = state
+            if self.inPlace:
+                parent = state.snapshot()
+            fast = self.fastSuccessors or self.inPlace
+            return self.batchEvaluation([successor(parent, agent, action, fast) for action in actions])
+        nextAgent = (agent + 1) % self.numAgents
+        values = []
+        for action in actions:
+            child, undo = descend(state, agent, action, self.fastSuccessors, self.inPlace)
+            values.append(self.expectimax(child, nextAgent, plies - 1)[0])
+            ascend(child, undo)
+        return values
+
+    def chanceOutcomes(self, state, agent):
+        "The (action, weight) pairs a chance node averages over"
+        distribution = self.ghostDistribution(state, agent)
+        if self.samples == None or len(distribution) <= self.samples:
+            return distribution
+        probabilities = [probability for action, probability in distribution]
+        actions = [action for action, probability in distribution]
+        counts = util.Counter()
+        for i in range(self.samples):
+            counts[util.sample(probabilities, actions)] += 1.0 / self.samples
+        return [(action, counts[action]) for action in actions if counts[action] > 0]
+
+class MonteCarloNode:
+    """
+    A node of MonteCarloTreeSearch: the sequence of Pacman actions that leads
+    to it from the root, with the number of playouts through it and the sum of
+    their values.
+    """
+    def __init__(self, parent=None, action=None):
+        self.parent = parent
+        self.action = action
+        self.children = {}
+        self.visits = 0
+        self.total = 0.0
+
+def greedyPacmanAction(state):
+    """
+    A cheap rollout policy for Pacman: step onto food or a capsule if one is
+    next to him, never step next to a ghost that is not scared if that can be
+    avoided, and otherwise move at random (stopping only as a last resort).
+    """
+    actions = [action for action in state.getLegalActions(0) if action != Directions.STOP]
+    if len(actions) == 0:
+        return Directions.STOP
+    food, capsules = state.getFood(), state.getCapsules()
+    dangers = []
+    for ghost in state.getGhostStates():
+        if ghost.scaredTimer == 0:
+            x, y = ghost.getPosition()
+            dangers += [(x, y), (x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
+    safe, eating = [], []
+    for action in actions:
+        x, y = Actions.getSuccessor(state.getPacmanPosition(), action)
+        if (x, y) in dangers:
+            continue
+        safe.append(action)
+        if food[int(x)][int(y)] or (x, y) in capsules:
+            eating.append(action)
+    return random.choice(eating or safe or actions)
+
+class MonteCarloTreeSearch:
+    """
+    UCT over Pacman's actions (open loop: a node stands for a sequence of
+    Pacman actions, and the ghost moves in between are drawn again from
+    ghostPolicy in every playout, so they are treated as chance).
+
+    Every playout walks down the tree from the root choosing the child with
+    the highest upper confidence bound, adds one new child, plays on with
+    pacmanPolicy and ghostPolicy for rolloutDepth Pacman moves and backs the
+    evaluation of the final state up the path.  Values are scaled to [0, 1] by
+    the lowest and highest ones seen so far before the bound is computed.
+
+    advanceRoot keeps the subtree below the action that was played, so the
+    playouts of one move are not thrown away at the next.
+    """
+    def __init__(self, evaluationFunction, ghostPolicy, pacmanPolicy=greedyPacmanAction,
+                 rolloutDepth=10, exploration=math.sqrt(2), fastSuccessors=False):
+        self.evaluationFunction = evaluationFunction
+        self.fastSuccessors = fastSuccessors
+        self.ghostPolicy = ghostPolicy
+        self.pacmanPolicy = pacmanPolicy
+        self.rolloutDepth = rolloutDepth
+        self.exploration = exploration
+        self.root = MonteCarloNode()
+        self.low, self.high = None, None
+        self.playouts = 0
+
+    def reset(self):
+        self.root = MonteCarloNode()
+        self.low, self.high = None, None
+
+    def advanceRoot(self, action):
+        "Makes the child for action (or a fresh node) the new root"
+        child = self.root.children.get(action)
+        if child == None:
+            child = MonteCarloNode()
+        child.parent, child.action = None, None
+        self.root = child
+
+    def search(self, gameState, timeLimit=None, maxPlayouts=None):
+        """
+        Runs playouts from gameState until timeLimit seconds have passed or
+        maxPlayouts playouts were played (at least one of the two must be
+        given), and returns the legal action whose child was visited most.
+        """
+        deadline = None
+        if timeLimit != None:
+            deadline = time.time() + timeLimit
+        self.playouts = 0
+        while True:
+            self.playout(gameState)
+            self.playouts += 1
+            if maxPlayouts != None and self.playouts >= maxPlayouts:
+                break
+            if deadline != None and time.time() > deadline:
+                break
+        legal = gameState.getLegalActions(0)
+        visits = [(self.root.children[action].visits, action) for action in legal if action in self.root.children]
+        if len(visits) == 0:
+            return random.choice(legal)
+        return max(visits)[1]
+
+    def playout(self, state):
+        "One selection, expansion, rollout and backup from the root at state"
+        node = self.root
+        path = [node]
+        while not state.isWin() and not state.isLose():
+            legal = state.getLegalActions(0)
+            untried = [action for action in legal if action not in node.children]
+            if untried:
+                action = random.choice(untried)
+                node.children[action] = MonteCarloNode(node, action)
+                node = node.children[action]
+                path.append(node)
+                state = self.advance(state, action)
+                break
+            node = self.select(node, legal)
+            path.append(node)
+            state = self.advance(state, node.action)
+
+        for i in range(self.rolloutDepth):
+            if state.isWin() or state.isLose():
+                break
+            state = self.advance(state, self.pacmanPolicy(state))
+        value = self.evaluationFunction(state)
+
+        if self.low == None or value < self.low:
+            self.low = value
+        if self.high == None or value > self.high:
+            self.high = value
+        for node in path:
+            node.visits += 1
+            node.total += value
+
+    def advance(self, state, action):
+        "Pacman plays action, then every ghost moves by ghostPolicy"
+        state = successor(state, 0, action, self.fastSuccessors)
+        for agent in range(1, state.getNumAgents()):
+            if state.isWin() or state.isLose():
+                break
+            state = successor(state, agent, self.ghostPolicy(state, agent), self.fastSuccessors)
+        return state
+
+    def select(self, node, legal):
+        "The child of node (among the legal actions) with the highest UCB1 value"
+        spread = self.high - self.low or 1.0
+        logVisits = math.log(node.visits)
+        best, bestBound = None, None
+        for action in legal:
+            child = node.children[action]
+            mean = (child.total / child.visits - self.low) / spread
+            bound = mean + self.exploration * math.sqrt(logVisits / child.visits)
+            if bestBound == None or bound > bestBound:
+                best, bestBound = child, bound
+        return best
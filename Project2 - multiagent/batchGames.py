@@ -0,0 +1,184 @@
+# batchGames.py
+# -------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Plays many headless games of Pacman over a pool of worker processes and
+reports the win rate and the average score, with 95% confidence intervals,
+while the results come in.
+
+The options after '--' are those of pacman.py; every worker reads them once
+and keeps its agents for all the games it plays, as runGames does.  Each game
+has its own seed, drawn from util.FixedRandom, so a game plays the same
+whichever worker gets it and the whole run can be repeated.  A line of JSON
+with the score, the outcome, the number of moves and the time Pacman spent
+thinking is written for every game as soon as it is over.
+
+  python batchGames.py -w 4 -o games.jsonl -- -p ExpectimaxAgent -l smallClassic -a depth=2 -n 1000
+
+Agents that learn between games, or that start processes of their own (the
+ParallelSearchAgent), need -w 1, which plays all games in this process.
+"""
+
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+import pacman
+import textDisplay
+import util
+
+# The game settings of this worker process, set by initWorker
+WORKER = {}
+
+def initWorker(pacmanArgv):
+    "Reads the pacman.py options once per worker and times Pacman's moves"
+    args = pacman.readCommand(pacmanArgv + ['--quietTextGraphics'])
+    agent = args['pacman']
+    getAction = agent.getAction
+    def timedGetAction(state):
+        start = time.time()
+        try:
+            return getAction(state)
+        finally:
+            WORKER['agentTime'] += time.time() - start
+    agent.getAction = timedGetAction
+    WORKER['args'] = args
+    WORKER['agentTime'] = 0.0
+
+def playGame(task):
+    "Plays one game with its own seed and returns its result as a dictionary"
+    index, seed = task
+    args = WORKER['args']
+    random.seed(seed)
+    rules = pacman.ClassicGameRules(args['timeout'])
+    rules.quiet = True
+    game = rules.newGame(args['layout'], args['pacman'], args['ghosts'], textDisplay.NullGraphics(),
+                         True, args['catchExceptions'])
+    WORKER['agentTime'] = 0.0
+    start = time.time()
+    game.run()
+    return {
+        'game': index,
+        'seed': seed,
+        'score': game.state.getScore(),
+        'win': game.state.isWin(),
+        'moves': len(game.moveHistory),
+        'agentSeconds': round(WORKER['agentTime'], 4),
+        'seconds': round(time.time() - start, 4),
+    }
+
+def gameSeeds(numGames):
+    "One seed per game, the same for every run"
+    generator = util.FixedRandom().random
+    return [generator.randint(0, 2 ** 31 - 1) for i in range(numGames)]
+
+def winRateInterval(wins, games, z=1.96):
+    "The Wilson score interval of a win rate"
+    if games == 0: return (0.0, 1.0)
+    rate = float(wins) / games
+    center = (rate + z * z / (2 * games)) / (1 + z * z / games)
+    spread = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games)) / (1 + z * z / games)
+    return (max(0.0, center - spread), min(1.0, center + spread))
+
+class BatchStatistics:
+    "Running totals of the results of a batch"
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.scoreSum = 0.0
+        self.scoreSquares = 0.0
+        self.agentSeconds = 0.0
+
+    def add(self, result):
+        self.games += 1
+        self.wins += int(result['win'])
+        self.scoreSum += result['score']
+        self.scoreSquares += result['score'] ** 2
+        self.agentSeconds += result['agentSeconds']
+
+    def scoreInterval(self, z=1.96):
+        "The mean score and the half width of its normal confidence interval"
+        mean = self.scoreSum / self.games
+        if self.games < 2: return mean, float('inf')
+        variance = max(0.0, (self.scoreSquares - self.games * mean * mean) / (self.games - 1))
+        return mean, z * math.sqrt(variance / self.games)
+
+    def summary(self, numGames):
+        low, high = winRateInterval(self.wins, self.games)
+        mean, halfWidth = self.scoreInterval()
+        return 'Games %d/%d  Win Rate: %.3f [%.3f, %.3f]  Score: %.1f +- %.1f  Agent time/game: %.2fs' % (
+            self.games, numGames, float(self.wins) / self.games, low, high, mean, halfWidth,
+            self.agentSeconds / self.games)
+
+def runBatch(pacmanArgv, numGames, workers, resultsPath, reportEvery):
+    tasks = list(enumerate(gameSeeds(numGames)))
+    pool = None
+    if workers == 1:
+        initWorker(pacmanArgv)
+        results = (playGame(task) for task in tasks)
+    else:
+        pool = multiprocessing.Pool(workers, initWorker, (pacmanArgv,))
+        results = pool.imap_unordered(playGame, tasks)
+    out = None
+    if resultsPath == '-':
+        out = sys.stdout
+    elif resultsPath != None:
+        out = open(resultsPath, 'a')
+    stats = BatchStatistics()
+    try:
+        for result in results:
+            stats.add(result)
+            if out != None:
+                out.write(json.dumps(result, sort_keys=True) + '\n')
+                out.flush()
+            if stats.games % reportEvery == 0 or stats.games == numGames:
+                print >>sys.stderr, stats.summary(numGames)
+    finally:
+        if out != None and out != sys.stdout:
+            out.close()
+        if pool != None:
+            pool.terminate()
+    return stats
+
+def readCommand(argv):
+    from optparse import OptionParser
+    usageStr = """
+    USAGE:      python batchGames.py <options> -- <pacman.py options>
+    EXAMPLE:    python batchGames.py -w 4 -o games.jsonl -- -p ExpectimaxAgent -l smallClassic -n 1000
+    """
+    parser = OptionParser(usageStr)
+    parser.add_option('-w', '--workers', dest='workers', type='int', default=multiprocessing.cpu_count(),
+                      help='number of worker processes [Default: %default]')
+    parser.add_option('-o', '--output', dest='output', default=None,
+                      help='append one line of JSON per game to this file; - for stdout')
+    parser.add_option('-r', '--reportEvery', dest='reportEvery', type='int', default=10,
+                      help='print the running statistics after this many games [Default: %default]')
+    if '--' in argv:
+        split = argv.index('--')
+        argv, pacmanArgv = argv[:split], argv[split + 1:]
+    else:
+        pacmanArgv = []
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        parser.error('Command line input not understood: ' + str(otherjunk))
+    pacmanOptions = pacman.readCommand(pacmanArgv + ['--quietTextGraphics'])
+    if pacmanOptions.get('numTraining', 0) > 0:
+        parser.error('training games (-x) are not played in batches; train with pacman.py')
+    return options, pacmanArgv, pacmanOptions['numGames']
+
+if __name__ == '__main__':
+    options, pacmanArgv, numGames = readCommand(sys.argv[1:])
+    runBatch(pacmanArgv, numGames, options.workers, options.output, options.reportEvery)
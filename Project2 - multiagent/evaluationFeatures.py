@@ -0,0 +1,230 @@
+# evaluationFeatures.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Features of GameStates for evaluation functions, extracted for a whole batch
+of states at once.
+
+The distances are maze distances, looked up in distance fields that are
+computed once per maze: one breadth first search from every open cell.  The
+cells are numbered x * height + y, which is the order of Grid.data laid out
+end to end, so a food grid turns into a row of booleans without a loop.
+
+With numpy the batch is scored with array operations: the food grids of the
+states become one boolean matrix, the distance field of every Pacman
+position another, and the nearest food of every state is one masked minimum.
+Without numpy the same features are computed state by state, from the cells
+of each field sorted by distance, so the nearest food is usually found after
+a few lookups.  Both give the same numbers.
+
+  extractor = getExtractor(gameState.getWalls())
+  features = extractor.extract(states)      # name -> one value per state
+  values = extractor.evaluate(states, {'score': 1.0, 'nearestFood': -2.5})
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from game import getMoveTable
+
+INFINITY = float('inf')
+
+FEATURE_NAMES = ['score', 'foodLeft', 'nearestFood', 'capsulesLeft', 'nearestCapsule',
+                 'nearestGhost', 'ghostThreat', 'nearestScaredGhost', 'scaredTime']
+
+class MazeDistanceFields:
+    """
+    The maze distance from every cell to every other cell; walls and cells
+    that cannot be reached are at distance INFINITY.  fields[cell] is the
+    distance field of one cell, indexed by cell; it is a numpy array (all
+    fields together form a matrix) when numpy is available and a list
+    otherwise.  byDistance[cell] lists the reachable cells by increasing
+    distance from cell, as (distance, x, y).
+    """
+    def __init__(self, walls):
+        self.width, self.height = walls.width, walls.height
+        moves = getMoveTable(walls)
+        size = self.width * self.height
+        fields = []
+        self.byDistance = []
+        for x in range(self.width):
+            for y in range(self.height):
+                field = [INFINITY] * size
+                order = []
+                if not walls[x][y]:
+                    field[x * self.height + y] = 0
+                    order.append((0, x, y))
+                    for distance, cx, cy in order:
+                        for nx, ny in moves.getLegalNeighbors((cx, cy)):
+                            if field[nx * self.height + ny] == INFINITY:
+                                field[nx * self.height + ny] = distance + 1
+                                order.append((distance + 1, nx, ny))
+                fields.append(field)
+                self.byDistance.append(order)
+        if numpy != None:
+            fields = numpy.array(fields, dtype=float)
+        self.fields = fields
+
+    def cell(self, position):
+        "The number of the cell at position, rounded to the grid"
+        x, y = position
+        return int(x + 0.5) * self.height + int(y + 0.5)
+
+DISTANCE_FIELDS = {}
+
+def getDistanceFields(walls):
+    "The MazeDistanceFields of a maze, computed once for every distinct walls Grid"
+    if walls not in DISTANCE_FIELDS:
+        DISTANCE_FIELDS[walls] = MazeDistanceFields(walls)
+    return DISTANCE_FIELDS[walls]
+
+EXTRACTORS = {}
+# the walls Grid of the last lookup and its extractor
+LAST_EXTRACTOR = [None, None]
+
+def getExtractor(walls):
+    """
+    The FeatureExtractor of a maze, one for every distinct walls Grid, as
+    getDistanceFields keeps them.  The states searched from one root share
+    its walls Grid, so the last one looked up is also remembered by
+    identity, and the grid is hashed once per move rather than once per
+    evaluation.
+    """
+    if LAST_EXTRACTOR[0] is walls:
+        return LAST_EXTRACTOR[1]
+    if walls not in EXTRACTORS:
+        EXTRACTORS[walls] = FeatureExtractor(walls)
+    LAST_EXTRACTOR[0], LAST_EXTRACTOR[1] = walls, EXTRACTORS[walls]
+    return LAST_EXTRACTOR[1]
+
+class FeatureExtractor:
+    """
+    Extracts the features in FEATURE_NAMES from a batch of GameStates of one
+    maze, all with the same number of agents:
+
+      score               the game score
+      foodLeft            the number of food dots left
+      nearestFood         the maze distance to the nearest food (0 if none)
+      capsulesLeft        the number of capsules left
+      nearestCapsule      the maze distance to the nearest capsule (0 if none)
+      nearestGhost        the maze distance to the nearest ghost that is not
+                          scared (INFINITY if none)
+      ghostThreat         1 / nearestGhost, and 2 when a ghost is on Pacman
+      nearestScaredGhost  the maze distance to the nearest scared ghost
+                          (INFINITY if none)
+      scaredTime          the scared timers of all ghosts added up
+    """
+    def __init__(self, walls):
+        self.distances = getDistanceFields(walls)
+
+    def extract(self, states):
+        "A dictionary from feature name to the values of the states, in order"
+        if numpy != None:
+            return self.extractArrays(states)
+        return self.extractLists(states)
+
+    def evaluate(self, states, weights):
+        """
+        The weighted sum of the features of every state, as a list; features
+        without a weight are not used.
+        """
+        features = self.extract(states)
+        if numpy != None:
+            values = numpy.zeros(len(states))
+            for name, weight in weights.items():
+                values += weight * features[name]
+            return values.tolist()
+        values = [0.0] * len(states)
+        for name, weight in weights.items():
+            values = [value + weight * feature for value, feature in zip(values, features[name])]
+        return values
+
+    def extractArrays(self, states):
+        distances = self.distances
+        count = len(states)
+        ghostIndices = range(1, states[0].getNumAgents())
+        pacmanCells = numpy.array([distances.cell(state.getPacmanPosition()) for state in states])
+        pacmanFields = distances.fields[pacmanCells]
+        features = {}
+        features['score'] = numpy.array([state.getScore() for state in states], dtype=float)
+
+        food = numpy.array([state.getFood().data for state in states], dtype=bool).reshape(count, -1)
+        features['foodLeft'] = food.sum(axis=1).astype(float)
+        nearestFood = numpy.where(food, pacmanFields, INFINITY).min(axis=1)
+        nearestFood[features['foodLeft'] == 0] = 0
+        features['nearestFood'] = nearestFood
+
+        capsules = [state.getCapsules() for state in states]
+        features['capsulesLeft'] = numpy.array([len(c) for c in capsules], dtype=float)
+        features['nearestCapsule'] = numpy.array([min([field[distances.cell(p)] for p in c] or [0])
+                                                  for field, c in zip(pacmanFields, capsules)], dtype=float)
+
+        if len(ghostIndices) == 0:
+            features['nearestGhost'] = features['nearestScaredGhost'] = numpy.repeat(INFINITY, count)
+            features['ghostThreat'] = features['scaredTime'] = numpy.zeros(count)
+            return features
+        ghostCells = numpy.array([[distances.cell(state.getGhostPosition(i)) for i in ghostIndices]
+                                  for state in states])
+        timers = numpy.array([[state.getGhostState(i).scaredTimer for i in ghostIndices]
+                              for state in states], dtype=float)
+        ghostDistances = pacmanFields[numpy.arange(count)[:, None], ghostCells]
+        nearestGhost = numpy.where(timers == 0, ghostDistances, INFINITY).min(axis=1)
+        features['nearestGhost'] = nearestGhost
+        features['ghostThreat'] = numpy.where(nearestGhost == 0, 2.0, 1.0 / numpy.maximum(nearestGhost, 1))
+        features['nearestScaredGhost'] = numpy.where(timers > 0, ghostDistances, INFINITY).min(axis=1)
+        features['scaredTime'] = timers.sum(axis=1)
+        return features
+
+    def extractLists(self, states):
+        distances = self.distances
+        features = dict([(name, []) for name in FEATURE_NAMES])
+        for state in states:
+            pacmanCell = distances.cell(state.getPacmanPosition())
+            field = distances.fields[pacmanCell]
+            features['score'].append(state.getScore())
+
+            food = state.getFood()
+            foodLeft = state.getNumFood()
+            nearestFood = 0
+            if foodLeft > 0:
+                for distance, x, y in distances.byDistance[pacmanCell]:
+                    if food[x][y]:
+                        nearestFood = distance
+                        break
+            features['foodLeft'].append(float(foodLeft))
+            features['nearestFood'].append(nearestFood)
+
+            capsules = state.getCapsules()
+            features['capsulesLeft'].append(float(len(capsules)))
+            features['nearestCapsule'].append(min([field[distances.cell(p)] for p in capsules] or [0]))
+
+            nearestGhost = nearestScaredGhost = INFINITY
+            scaredTime = 0.0
+            for ghostState in state.getGhostStates():
+                distance = field[distances.cell(ghostState.getPosition())]
+                if ghostState.scaredTimer > 0:
+                    nearestScaredGhost = min(nearestScaredGhost, distance)
+                    scaredTime += ghostState.scaredTimer
+                else:
+                    nearestGhost = min(nearestGhost, distance)
+            features['nearestGhost'].append(nearestGhost)
+            if nearestGhost == 0:
+                features['ghostThreat'].append(2.0)
+            else:
+                features['ghostThreat'].append(1.0 / nearestGhost)
+            features['nearestScaredGhost'].append(nearestScaredGhost)
+            features['scaredTime'].append(scaredTime)
+        return features
@@ -17,6 +17,11 @@ from game import Directions
 import random, util
 
 from game import Agent
+import adversarialSearch
+import ghostAgents
+import parallelSearch
+import evaluationFeatures
+import time
 
 class ReflexAgent(Agent):
     """
@@ -195,6 +200,8 @@ def scoreEvaluationFunction(currentGameState):
     """
     return currentGameState.getScore()
 
+MOVE_TIME_FRACTION = 0.5
+
 class MultiAgentSearchAgent(Agent):
     """
       This class provides some common elements to all of your
@@ -214,6 +221,27 @@ class MultiAgentSearchAgent(Agent):
         self.index = 0 # Pacman is always agent index 0
         self.evaluationFunction = util.lookup(evalFn, globals())
         self.depth = int(depth)
+        self.timeLimit = None
+        self.moveTimeout = None
+
+    def setMoveTimeout(self, seconds):
+        "Called by ClassicGameRules.newGame with the time allowed for every move"
+        self.moveTimeout = seconds
+
+    def getTimeLimit(self):
+        """
+          The number of seconds an anytime agent may spend on a move: its
+          timeLimit, but never more than MOVE_TIME_FRACTION of the move timeout
+          of the game rules.  None if neither is known.
+        """
+        limits = []
+        if self.timeLimit != None:
+            limits.append(float(self.timeLimit))
+        if self.moveTimeout != None:
+            limits.append(self.moveTimeout * MOVE_TIME_FRACTION)
+        if len(limits) == 0:
+            return None
+        return min(limits)
 
 class MinimaxAgent(MultiAgentSearchAgent):
     """
@@ -381,7 +409,37 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
           Returns the minimax action using self.depth and self.evaluationFunction
         """
         "*** YOUR CODE HERE ***"
-        util.raiseNotDefined()
+        """ FUNCTIONALITY DESCRIPTION
+        the search itself is done by AlphaBetaSearch in adversarialSearch.py. with
+        move ordering and the transposition table switched off it visits the
+        actions in the order of getLegalActions and only prunes when a value is
+        strictly outside the alpha-beta window, so it expands exactly the states
+        a hand written alpha-beta would.
+        """
+        searcher = adversarialSearch.AlphaBetaSearch(self.evaluationFunction)
+        return searcher.search(gameState, self.depth)[1]
+
+class IterativeAlphaBetaAgent(AlphaBetaAgent):
+    """
+      Alpha-beta with killer/history move ordering and a transposition table,
+      deepened one level at a time until self.depth is reached or the time for
+      the move runs out.  The move is taken from the deepest search that
+      finished.  The time for a move is set by getTimeLimit:
+
+      > python pacman.py -p IterativeAlphaBetaAgent -l mediumClassic -a depth=8,timeLimit=0.5
+    """
+
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '20', timeLimit = None):
+        AlphaBetaAgent.__init__(self, evalFn, depth)
+        self.timeLimit = timeLimit
+        self.searcher = adversarialSearch.AlphaBetaSearch(self.evaluationFunction, ordering=True, transpositions=True,
+                                                          inPlace=True)
+        self.completedDepths = []
+
+    def getAction(self, gameState):
+        value, action, depth = self.searcher.iterativeDeepening(gameState, self.depth, self.getTimeLimit())
+        self.completedDepths.append(depth)
+        return action
 
 class ExpectimaxAgent(MultiAgentSearchAgent):
     """
@@ -458,6 +516,153 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
 
         util.raiseNotDefined()
 
+class SampledExpectimaxAgent(ExpectimaxAgent):
+    """
+      Expectimax that scales to deeper searches against several ghosts: the
+      value of every chance node is remembered for the rest of the move, a
+      chance node can average over a few sampled ghost actions instead of all
+      of them (samples, 0 for all), and the ghosts can be modelled as
+      DirectionalGhosts instead of choosing uniformly (ghostModel):
+
+      > python pacman.py -p SampledExpectimaxAgent -l mediumClassic -a depth=3,samples=2,ghostModel=directional
+    """
+
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2', samples = '0', ghostModel = 'uniform', memoize = 'True'):
+        ExpectimaxAgent.__init__(self, evalFn, depth)
+        if ghostModel == 'uniform':
+            ghostDistribution = adversarialSearch.uniformDistribution
+        elif ghostModel == 'directional':
+            ghostDistribution = self.directionalDistribution
+        else:
+            raise Exception('unknown ghostModel: ' + ghostModel)
+        self.ghostModels = {}
+        # Scoring leaves in bulk pays for copying them out of the in place
+        # search state only when the features are extracted with numpy
+        batchEvaluation = None
+        if evaluationFeatures.numpy != None:
+            batchEvaluation = BATCH_EVALUATIONS.get(self.evaluationFunction)
+        self.searcher = adversarialSearch.ExpectimaxSearch(self.evaluationFunction, ghostDistribution,
+                                                           int(samples) or None, memoize == True or memoize == 'True',
+                                                           inPlace=True, batchEvaluation=batchEvaluation)
+
+    def directionalDistribution(self, state, agent):
+        "The action probabilities of a DirectionalGhost with index agent"
+        if agent not in self.ghostModels:
+            self.ghostModels[agent] = ghostAgents.DirectionalGhost(agent)
+        distribution = self.ghostModels[agent].getDistribution(state)
+        return [(action, distribution[action]) for action in state.getLegalActions(agent)]
+
+    def getAction(self, gameState):
+        return self.searcher.search(gameState, self.depth)[1]
+
+class MCTSAgent(MultiAgentSearchAgent):
+    """
+      An anytime agent that runs UCT playouts (MonteCarloTreeSearch in
+      adversarialSearch.py) for as long as getTimeLimit allows, or for a fixed
+      number of playouts.  Rollouts move the ghosts as DirectionalGhosts and
+      Pacman greedily, for rolloutDepth Pacman moves, and are scored with the
+      evaluation function.  The subtree of the action that was played is kept
+      for the next move.
+
+      > python pacman.py -p MCTSAgent -l mediumClassic -a timeLimit=0.2,evalFn=better
+
+      With trees=N, N independent trees are grown in a pool of worker
+      processes for the same time and their root visit counts are summed
+      (parallelSearch.rootVisits); there is no subtree reuse in that mode.
+    """
+
+    def __init__(self, evalFn = 'scoreEvaluationFunction', timeLimit = '0.5', playouts = None,
+                 rolloutDepth = '10', exploration = '1.4', reuse = 'True', trees = '0', processes = None):
+        MultiAgentSearchAgent.__init__(self, evalFn)
+        self.trees = int(trees)
+        self.processes = processes
+        if processes != None:
+            self.processes = int(processes)
+        self.rolloutDepth, self.exploration = int(rolloutDepth), float(exploration)
+        self.move = 0
+        self.timeLimit = timeLimit
+        self.playouts = playouts
+        if playouts != None:
+            self.playouts = int(playouts)
+        self.reuse = reuse == True or reuse == 'True'
+        self.ghostModels = {}
+        self.searcher = adversarialSearch.MonteCarloTreeSearch(self.evaluationFunction, self.ghostAction,
+                                                               rolloutDepth=self.rolloutDepth,
+                                                               exploration=self.exploration,
+                                                               fastSuccessors=True)
+        self.expectedPosition = None
+
+    def ghostAction(self, state, agent):
+        "A move of ghost agent drawn as a DirectionalGhost would play it"
+        if agent not in self.ghostModels:
+            self.ghostModels[agent] = ghostAgents.DirectionalGhost(agent)
+        return self.ghostModels[agent].getAction(state)
+
+    def registerInitialState(self, gameState):
+        self.searcher.reset()
+        self.expectedPosition = None
+
+    def getAction(self, gameState):
+        timeLimit = self.getTimeLimit()
+        if self.playouts != None:
+            timeLimit = None
+        if self.trees > 0:
+            self.move += 1
+            return parallelSearch.rootVisits(gameState, self.evaluationFunction, self.move, self.trees, timeLimit,
+                                             self.playouts, self.rolloutDepth, self.exploration, self.processes)
+
+        if not self.reuse or gameState.getPacmanPosition() != self.expectedPosition:
+            self.searcher.reset()
+        action = self.searcher.search(gameState, timeLimit, self.playouts)
+        self.searcher.advanceRoot(action)
+        self.expectedPosition = gameState.generatePacmanSuccessor(action).getPacmanPosition()
+        return action
+
+class ParallelSearchAgent(MultiAgentSearchAgent):
+    """
+      Searches the subtree of every root action in its own worker process
+      (parallelSearch.py), with alpha-beta or expectimax.  Alpha-beta is
+      deepened iteratively up to self.depth while getTimeLimit allows, like
+      IterativeAlphaBetaAgent; expectimax searches to self.depth.  The chosen
+      actions are the same as those of the sequential search.
+
+      > python pacman.py -p ParallelSearchAgent -l mediumClassic -a depth=5,processes=8,timeLimit=1
+    """
+
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '3', algorithm = 'alphabeta',
+                 processes = None, timeLimit = None, samples = '0'):
+        MultiAgentSearchAgent.__init__(self, evalFn, depth)
+        self.algorithm = algorithm
+        self.processes = processes
+        if processes != None:
+            self.processes = int(processes)
+        self.timeLimit = timeLimit
+        self.options = {}
+        if algorithm == 'expectimax':
+            self.options['samples'] = int(samples) or None
+        self.move = 0
+        self.completedDepths = []
+
+    def getAction(self, gameState):
+        self.move += 1
+        timeLimit = self.getTimeLimit()
+        if self.algorithm != 'alphabeta' or timeLimit == None:
+            values = parallelSearch.rootValues(gameState, self.algorithm, self.depth, self.evaluationFunction,
+                                               self.move, self.processes, **self.options)
+            self.completedDepths.append(self.depth)
+            return parallelSearch.bestAction(values)[0]
+
+        deadline = time.time() + timeLimit
+        best, completed = None, 0
+        for depth in range(1, self.depth + 1):
+            values = parallelSearch.rootValues(gameState, self.algorithm, depth, self.evaluationFunction,
+                                               self.move, self.processes, deadline if depth > 1 else None)
+            if None in [value for action, value in values]:
+                break
+            best, completed = parallelSearch.bestAction(values), depth
+        self.completedDepths.append(completed)
+        return best[0]
+
 def betterEvaluationFunction(currentGameState):
     """
       Your extreme ghost-hunting, pellet-nabbing, food-gobbling, unstoppable
@@ -578,3 +783,31 @@ def betterEvaluationFunction(currentGameState):
 # Abbreviation
 better = betterEvaluationFunction
 
+FEATURE_WEIGHTS = {'score': 1.0, 'nearestFood': -2.5, 'foodLeft': -4.0, 'ghostThreat': -200.0,
+                   'capsulesLeft': -20.0}
+
+def featureEvaluationBatch(gameStates):
+    """
+      The values of a list of states under featureEvaluationFunction, scored
+      together: the features of the whole batch are extracted at once (see
+      evaluationFeatures.py).
+    """
+    extractor = evaluationFeatures.getExtractor(gameStates[0].getWalls())
+    return extractor.evaluate(gameStates, FEATURE_WEIGHTS)
+
+def featureEvaluationFunction(currentGameState):
+    """
+      A linear evaluation over maze distance features, in the spirit of
+      betterEvaluationFunction: the score, the distance to the nearest food,
+      the food and capsules left and the threat of the nearest ghost that is
+      not scared.  Searches that can score their leaves in bulk use
+      featureEvaluationBatch instead (see BATCH_EVALUATIONS).
+    """
+    return featureEvaluationBatch([currentGameState])[0]
+
+# Abbreviation
+feature = featureEvaluationFunction
+
+# Evaluation functions that can also score a list of states in one call
+BATCH_EVALUATIONS = {featureEvaluationFunction: featureEvaluationBatch}
+
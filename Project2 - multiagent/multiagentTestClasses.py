@@ -35,6 +35,9 @@ import layout, pacman
 import autograder
 # import grading
 
+# the tests count the states an agent generates
+GameState.trackExploration('set')
+
 VERBOSE = False
 
 class MultiagentTreeState(object):
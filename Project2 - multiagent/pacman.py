@@ -46,7 +46,7 @@ from game import Actions
 from util import nearestPoint
 from util import manhattanDistance
 import util, layout
-import sys, types, time, random, os
+import sys, types, time, random, os, heapq
 
 ###################################################
 # YOUR INTERFACE TO THE PACMAN WORLD: A GameState #
@@ -71,10 +71,41 @@ class GameState:
     # Accessor methods: use these to access state data #
     ####################################################
 
-    # static variable keeps track of which states have had getLegalActions called
+    # static variables that keep track of the states generateSuccessor makes;
+    # nothing is kept unless trackExploration switches it on
+    exploration = None
     explored = set()
+    exploredSketch = None
+    def trackExploration(mode='set'):
+        """
+        Switches the tracking of the states made by generateSuccessor:
+          None      nothing is tracked (the default), so games pay nothing for it
+          'set'     every state is kept in GameState.explored; the autograder
+                    counts the states searched by an agent this way
+          'sketch'  GameState.exploredSketch counts the states and estimates how
+                    many of them are distinct in a fixed amount of memory
+        Tracking starts afresh every time it is switched.
+        """
+        if mode not in (None, 'set', 'sketch'):
+            raise Exception('Unknown exploration tracking mode: ' + str(mode))
+        GameState.exploration = mode
+        GameState.explored = set()
+        GameState.exploredSketch = None
+        if mode == 'sketch':
+            GameState.exploredSketch = ExplorationSketch()
+    trackExploration = staticmethod(trackExploration)
+
+    def recordExplored(parent, child):
+        if GameState.exploration == 'set':
+            GameState.explored.add(parent)
+            GameState.explored.add(child)
+        elif GameState.exploration == 'sketch':
+            GameState.exploredSketch.add(parent)
+            GameState.exploredSketch.add(child)
+    recordExplored = staticmethod(recordExplored)
+
     def getAndResetExplored():
-        tmp = GameState.explored.copy()
+        tmp = GameState.explored
         GameState.explored = set()
         return tmp
     getAndResetExplored = staticmethod(getAndResetExplored)
@@ -120,8 +151,36 @@ class GameState:
         # Book keeping
         state.data._agentMoved = agentIndex
         state.data.score += state.data.scoreChange
-        GameState.explored.add(self)
-        GameState.explored.add(state)
+        if GameState.exploration != None:
+            GameState.recordExplored(self, state)
+        return state
+
+    def generateSuccessorFast( self, agentIndex, action ):
+        """
+        Returns the same successor as generateSuccessor, for an action that
+        came from getLegalActions(agentIndex), with much less copying: the new
+        state shares the food grid, the capsules and the states of the agents
+        that did not move with this one (copy-on-write), and the legality of
+        the action is not checked again.  The successor is not added to
+        GameState.explored.
+        """
+        if self.isWin() or self.isLose(): raise Exception('Can\'t generate a successor of a terminal state.')
+
+        state = GameState()
+        state.data = self.data.successorCopy( agentIndex )
+
+        if agentIndex == 0:  # Pacman is moving
+            state.data._eaten = [False for i in range(state.getNumAgents())]
+            PacmanRules.move( state, action )
+            state.data.scoreChange += -TIME_PENALTY
+        else:                # A ghost is moving
+            GhostRules.move( state, action, agentIndex )
+            GhostRules.decrementTimer( state.data.agentStates[agentIndex] )
+
+        GhostRules.checkDeath( state, agentIndex )
+
+        state.data._agentMoved = agentIndex
+        state.data.score += state.data.scoreChange
         return state
 
     def getLegalPacmanActions( self ):
@@ -253,6 +312,36 @@ class GameState:
         """
         self.data.initialize(layout, numGhostAgents)
 
+class ExplorationSketch:
+    """
+    Counts the states added to it and estimates how many of them are distinct
+    while keeping only the k smallest hash values seen (a k minimum values
+    sketch).  The hashes are spread over [0, 1), so if the k-th smallest is h
+    there are about (k - 1) / h distinct states; the estimate is exact until
+    k distinct states have been seen and within about 1/sqrt(k) after.
+    """
+    def __init__(self, k=256):
+        self.k = k
+        self.count = 0
+        self.smallest = []  # max-heap of the k smallest hashes, stored negated
+        self.members = set()
+
+    def add(self, state):
+        self.count += 1
+        h = ((hash(state) * 2654435761) & 0xffffffff) / 4294967296.0
+        if h in self.members: return
+        if len(self.smallest) < self.k:
+            heapq.heappush(self.smallest, -h)
+            self.members.add(h)
+        elif h < -self.smallest[0]:
+            self.members.discard(-heapq.heapreplace(self.smallest, -h))
+            self.members.add(h)
+
+    def distinct(self):
+        if len(self.smallest) < self.k:
+            return len(self.smallest)
+        return int((self.k - 1) / -self.smallest[0])
+
 ############################################################################
 #                     THE HIDDEN SECRETS OF PACMAN                         #
 #                                                                          #
@@ -275,6 +364,9 @@ class ClassicGameRules:
         agents = [pacmanAgent] + ghostAgents[:layout.getNumGhosts()]
         initState = GameState()
         initState.initialize( layout, len(ghostAgents) )
+        for i, agent in enumerate(agents):
+            if 'setMoveTimeout' in dir(agent):
+                agent.setMoveTimeout(self.getMoveTimeout(i))
         game = Game(agents, display, self, catchExceptions=catchExceptions)
         game.state = initState
         self.initialState = initState.deepCopy()
@@ -331,7 +423,8 @@ class PacmanRules:
         """
         Returns a list of possible actions.
         """
-        return Actions.getPossibleActions( state.getPacmanState().configuration, state.data.layout.walls )
+        conf = state.data.agentStates[0].configuration
+        return state.data.layout.getMoveTable().getPossibleActions( conf )
     getLegalActions = staticmethod( getLegalActions )
 
     def applyAction( state, action ):
@@ -341,7 +434,13 @@ class PacmanRules:
         legal = PacmanRules.getLegalActions( state )
         if action not in legal:
             raise Exception("Illegal action " + str(action))
+        PacmanRules.move( state, action )
+    applyAction = staticmethod( applyAction )
 
+    def move( state, action ):
+        """
+        Applies an action that is known to be legal.
+        """
         pacmanState = state.data.agentStates[0]
 
         # Update Configuration
@@ -354,15 +453,14 @@ class PacmanRules:
         if manhattanDistance( nearest, next ) <= 0.5 :
             # Remove food
             PacmanRules.consume( nearest, state )
-    applyAction = staticmethod( applyAction )
+    move = staticmethod( move )
 
     def consume( position, state ):
         x,y = position
         # Eat food
         if state.data.food[x][y]:
             state.data.scoreChange += 10
-            state.data.food = state.data.food.copy()
-            state.data.food[x][y] = False
+            state.data.food = state.data.food.copyWith(x, y, False)
             state.data._foodEaten = position
             # TODO: cache numFood?
             numFood = state.getNumFood()
@@ -371,10 +469,11 @@ class PacmanRules:
                 state.data._win = True
         # Eat capsule
         if( position in state.getCapsules() ):
-            state.data.capsules.remove( position )
+            state.data.capsules = [capsule for capsule in state.data.capsules if capsule != position]
             state.data._capsuleEaten = position
-            # Reset all ghosts' scared timers
+            # Reset all ghosts' scared timers (on copies: they may be shared)
             for index in range( 1, len( state.data.agentStates ) ):
+                state.data.agentStates[index] = state.data.agentStates[index].copy()
                 state.data.agentStates[index].scaredTimer = SCARED_TIME
     consume = staticmethod( consume )
 
@@ -389,13 +488,7 @@ class GhostRules:
         reach a dead end, but can turn 90 degrees at intersections.
         """
         conf = state.getGhostState( ghostIndex ).configuration
-        possibleActions = Actions.getPossibleActions( conf, state.data.layout.walls )
-        reverse = Actions.reverseDirection( conf.direction )
-        if Directions.STOP in possibleActions:
-            possibleActions.remove( Directions.STOP )
-        if reverse in possibleActions and len( possibleActions ) > 1:
-            possibleActions.remove( reverse )
-        return possibleActions
+        return state.data.layout.getMoveTable().getGhostActions( conf )
     getLegalActions = staticmethod( getLegalActions )
 
     def applyAction( state, action, ghostIndex):
@@ -403,13 +496,19 @@ class GhostRules:
         legal = GhostRules.getLegalActions( state, ghostIndex )
         if action not in legal:
             raise Exception("Illegal ghost action " + str(action))
+        GhostRules.move( state, action, ghostIndex )
+    applyAction = staticmethod( applyAction )
 
+    def move( state, action, ghostIndex ):
+        """
+        Applies an action that is known to be legal.
+        """
         ghostState = state.data.agentStates[ghostIndex]
         speed = GhostRules.GHOST_SPEED
         if ghostState.scaredTimer > 0: speed /= 2.0
         vector = Actions.directionToVector( action, speed )
         ghostState.configuration = ghostState.configuration.generateSuccessor( vector )
-    applyAction = staticmethod( applyAction )
+    move = staticmethod( move )
 
     def decrementTimer( ghostState):
         timer = ghostState.scaredTimer
@@ -425,6 +524,8 @@ class GhostRules:
                 ghostState = state.data.agentStates[index]
                 ghostPosition = ghostState.configuration.getPosition()
                 if GhostRules.canKill( pacmanPosition, ghostPosition ):
+                    # collide edits the ghost, which may be shared with the parent
+                    ghostState = state.data.agentStates[index] = ghostState.copy()
                     GhostRules.collide( state, ghostState, index )
         else:
             ghostState = state.data.agentStates[agentIndex]
@@ -523,6 +624,8 @@ def readCommand( argv ):
                       help='Turns on exception handling and timeouts during games', default=False)
     parser.add_option('--timeout', dest='timeout', type='int',
                       help=default('Maximum length of time an agent can spend computing in a single game'), default=30)
+    parser.add_option('--exploration', dest='exploration', type='choice', choices=['set', 'sketch'],
+                      help='Track the states agents generate, exactly (set) or in bounded memory (sketch)', default=None)
 
     options, otherjunk = parser.parse_args(argv)
     if len(otherjunk) != 0:
@@ -532,6 +635,8 @@ def readCommand( argv ):
     # Fix the random seed
     if options.fixRandomSeed: random.seed('cs188')
 
+    if options.exploration: GameState.trackExploration(options.exploration)
+
     # Choose a layout
     args['layout'] = layout.getLayout( options.layout )
     if args['layout'] == None: raise Exception("The layout " + options.layout + " cannot be found")
@@ -663,6 +768,12 @@ def runGames( layout, pacman, ghosts, display, numGames, record, numTraining = 0
         print 'Win Rate:      %d/%d (%.2f)' % (wins.count(True), len(wins), winRate)
         print 'Record:       ', ', '.join([ ['Loss', 'Win'][int(w)] for w in wins])
 
+    if GameState.exploration == 'set':
+        print 'Explored:      %d distinct states' % len(GameState.explored)
+    elif GameState.exploration == 'sketch':
+        sketch = GameState.exploredSketch
+        print 'Explored:      %d states generated, about %d distinct' % (sketch.count, sketch.distinct())
+
     return games
 
 if __name__ == '__main__':
@@ -0,0 +1,152 @@
+# parallelSearch.py
+# -----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Root parallel game tree search over a multiprocessing pool.
+
+Every legal action of Pacman at the root leads to a subtree that can be
+searched on its own, so each one is sent (as a pickled GameState) to a worker
+process, which searches it with the engines of adversarialSearch.py and sends
+back its value.  The values come back in the order of getLegalActions and the
+best one is picked exactly as the sequential search would pick it, ties going
+to the first action, so the parallel and the sequential agents agree move for
+move.  The only thing lost is the pruning across root actions of alpha-beta.
+
+Each worker keeps one searcher for the whole game.  Its transposition table
+and expectimax cache are shared by all the subtrees the worker searches for
+the same move, across all iterations of iterative deepening, and are emptied
+when the next move starts.  A table shared between processes would cost more
+in locking and pickling than the transpositions between subtrees save.
+
+For MCTS the workers each grow their own tree from the root for the same time
+(root parallelization) and the visit counts of the root actions are summed.
+"""
+
+import multiprocessing
+import random
+import adversarialSearch
+import ghostAgents
+import searchState
+
+POOLS = {}
+
+def getPool(processes=None):
+    "A pool of worker processes, created once per size and kept for the run"
+    if processes not in POOLS:
+        POOLS[processes] = multiprocessing.Pool(processes)
+    return POOLS[processes]
+
+GHOST_MODELS = {}
+
+def directionalGhostAction(state, agent):
+    "A move of ghost agent drawn as a DirectionalGhost would play it"
+    if agent not in GHOST_MODELS:
+        GHOST_MODELS[agent] = ghostAgents.DirectionalGhost(agent)
+    return GHOST_MODELS[agent].getAction(state)
+
+# The searcher of this worker process, its settings and the move it works on
+WORKER = {'searcher': None, 'key': None, 'move': None}
+
+def getWorkerSearcher(algorithm, evaluationFunction, move, options):
+    """
+    The searcher of the current process, reset when the move or the settings
+    change.
+    """
+    key = (algorithm, evaluationFunction, tuple(sorted(options.items())))
+    if WORKER['key'] != key:
+        if algorithm == 'alphabeta':
+            searcher = adversarialSearch.AlphaBetaSearch(evaluationFunction, ordering=True, transpositions=True,
+                                                         inPlace=True)
+        elif algorithm == 'expectimax':
+            searcher = adversarialSearch.ExpectimaxSearch(evaluationFunction, samples=options.get('samples'),
+                                                          memoize=True, inPlace=True)
+        else:
+            raise Exception('unknown algorithm: ' + algorithm)
+        WORKER['searcher'], WORKER['key'], WORKER['move'] = searcher, key, None
+    searcher = WORKER['searcher']
+    if WORKER['move'] != move:
+        WORKER['move'] = move
+        if algorithm == 'alphabeta':
+            searcher.table, searcher.killers = {}, {}
+        else:
+            searcher.cache = {}
+    return searcher
+
+def searchSubtree(task):
+    """
+    Worker side of rootValues: the value of one root action, or None if the
+    deadline passed first.
+    """
+    algorithm, state, plies, evaluationFunction, move, seed, deadline, options = task
+    searcher = getWorkerSearcher(algorithm, evaluationFunction, move, options)
+    searcher.numAgents = state.getNumAgents()
+    state = searchState.SearchState(state)
+    random.seed(seed)
+    if algorithm == 'alphabeta':
+        searcher.deadline = deadline
+        try:
+            return searcher.alphaBeta(state, 1 % searcher.numAgents, plies, 1, -float('inf'), float('inf'))[0]
+        except adversarialSearch.SearchTimeout:
+            return None
+    return searcher.expectimax(state, 1 % searcher.numAgents, plies)[0]
+
+def rootValues(gameState, algorithm, depth, evaluationFunction, move, processes=None, deadline=None, **options):
+    """
+    Searches the subtree of every legal Pacman action at gameState to depth in
+    parallel and returns (action, value) pairs in getLegalActions order.  A
+    value is None if its search ran past the deadline.  algorithm is
+    'alphabeta' or 'expectimax'; move numbers the root, so the workers know
+    when to forget their tables; options go to the expectimax searcher.
+    """
+    actions = gameState.getLegalActions(0)
+    plies = depth * gameState.getNumAgents() - 1
+    tasks = [(algorithm, gameState.generateSuccessorFast(0, action), plies, evaluationFunction,
+              move, hash((move, i)), deadline, options)
+             for i, action in enumerate(actions)]
+    values = getPool(processes).map(searchSubtree, tasks)
+    return zip(actions, values)
+
+def bestAction(actionValues):
+    "The action with the highest value; ties go to the first one"
+    best = None
+    for action, value in actionValues:
+        if best == None or value > best[1]:
+            best = (action, value)
+    return best
+
+def mctsVisits(task):
+    "Worker side of rootVisits: the root visit counts of one independent tree"
+    state, evaluationFunction, seed, timeLimit, playouts, rolloutDepth, exploration = task
+    random.seed(seed)
+    searcher = adversarialSearch.MonteCarloTreeSearch(evaluationFunction, directionalGhostAction,
+                                                      rolloutDepth=rolloutDepth, exploration=exploration,
+                                                      fastSuccessors=True)
+    searcher.search(state, timeLimit, playouts)
+    return dict((action, child.visits) for action, child in searcher.root.children.items())
+
+def rootVisits(gameState, evaluationFunction, seed, trees, timeLimit=None, playouts=None,
+               rolloutDepth=10, exploration=1.4, processes=None):
+    """
+    Grows 'trees' independent MCTS trees from gameState in the pool and
+    returns the legal action with the most playouts summed over all trees;
+    ties go to the first action in getLegalActions order.  With a fixed
+    number of playouts the result only depends on seed.
+    """
+    tasks = [(gameState, evaluationFunction, hash((seed, i)), timeLimit, playouts, rolloutDepth, exploration)
+             for i in range(trees)]
+    totals = {}
+    for visits in getPool(processes).map(mctsVisits, tasks):
+        for action, count in visits.items():
+            totals[action] = totals.get(action, 0) + count
+    return bestAction([(action, totals.get(action, 0)) for action in gameState.getLegalActions(0)])[0]
@@ -0,0 +1,188 @@
+# searchState.py
+# --------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+A game state that a search walks by changing it in place.
+
+generateSuccessor builds a new GameState for every node of a game tree.  A
+SearchState is made once from the root instead; makeMove applies an action to
+it in place and returns an undo record, and unmakeMove puts back exactly what
+the move changed (agent configurations, the eaten food and capsule, scared
+timers, the score and the win and lose flags):
+
+  state = SearchState(gameState)
+  undo = state.makeMove(0, Directions.WEST)
+  ...                                   # search below the move
+  state.unmakeMove(undo)
+
+The moves follow the rules of PacmanRules and GhostRules in pacman.py.  All
+the read accessors of GameState work as usual, so evaluation functions take
+a SearchState unchanged, but whatever they return (the food grid, the
+capsule list, the ghost states) changes with the next move.  For the same
+reason a SearchState must not be used as a dictionary key: key() returns a
+hashable value that identifies the current position, and snapshot() an
+ordinary GameState.
+"""
+
+import random
+from game import Actions, Configuration, GameStateData
+from pacman import GameState, PacmanRules, GhostRules, SCARED_TIME, TIME_PENALTY
+from util import nearestPoint, manhattanDistance
+
+FOOD_KEYS = {}
+
+def getFoodKeys(width, height):
+    "Random 64 bit numbers for every cell, xor-ed together to key the food grid"
+    if (width, height) not in FOOD_KEYS:
+        generator = random.Random(width * 1000 + height)
+        FOOD_KEYS[(width, height)] = [[generator.getrandbits(64) for y in range(height)] for x in range(width)]
+    return FOOD_KEYS[(width, height)]
+
+class SearchState(GameState):
+    """
+    A mutable copy of a GameState, changed by makeMove and restored by
+    unmakeMove.  Moves must be legal (taken from getLegalActions) and undone
+    in the reverse order they were made.
+    """
+    def __init__(self, gameState):
+        GameState.__init__(self)
+        self.data = gameState.data.deepCopy()
+        self.data._win = gameState.isWin()
+        self.data._lose = gameState.isLose()
+        food = self.data.food
+        self.numFood = food.count()
+        self.foodKeys = getFoodKeys(food.width, food.height)
+        self.foodKey = 0
+        for x, y in food.asList():
+            self.foodKey ^= self.foodKeys[x][y]
+
+    def makeMove(self, agentIndex, action):
+        """
+        Applies action by agent agentIndex to this state and returns the
+        record unmakeMove needs to take it back.
+        """
+        data = self.data
+        if data._win or data._lose: raise Exception('Can\'t generate a successor of a terminal state.')
+        changed = []
+        # score, win, lose, changed agents, eaten food, (index, eaten capsule)
+        undo = [data.score, data._win, data._lose, changed, None, None]
+        agentState = data.agentStates[agentIndex]
+        configuration = agentState.configuration
+        changed.append((agentIndex, configuration, agentState.scaredTimer))
+
+        if agentIndex == 0:  # Pacman is moving
+            vector = Actions.directionToVector(action, PacmanRules.PACMAN_SPEED)
+            agentState.configuration = configuration.generateSuccessor(vector)
+            position = agentState.configuration.getPosition()
+            nearest = nearestPoint(position)
+            scoreChange = -TIME_PENALTY
+            if manhattanDistance(nearest, position) <= 0.5:
+                scoreChange += self.consume(nearest, undo)
+            for index in range(1, len(data.agentStates)):
+                scoreChange += self.checkDeath(index, changed)
+        else:                # A ghost is moving
+            speed = GhostRules.GHOST_SPEED
+            if agentState.scaredTimer > 0: speed /= 2.0
+            configuration = configuration.generateSuccessor(Actions.directionToVector(action, speed))
+            if agentState.scaredTimer == 1:
+                configuration = Configuration(nearestPoint(configuration.pos), configuration.direction)
+            agentState.configuration = configuration
+            agentState.scaredTimer = max(0, agentState.scaredTimer - 1)
+            scoreChange = self.checkDeath(agentIndex, changed)
+
+        data.score += scoreChange
+        return undo
+
+    def unmakeMove(self, undo):
+        "Takes back the move that returned undo"
+        data = self.data
+        data.score, data._win, data._lose, changed, food, capsule = undo
+        for index, configuration, scaredTimer in reversed(changed):
+            agentState = data.agentStates[index]
+            agentState.configuration = configuration
+            agentState.scaredTimer = scaredTimer
+        if food != None:
+            x, y = food
+            data.food[x][y] = True
+            self.numFood += 1
+            self.foodKey ^= self.foodKeys[x][y]
+        if capsule != None:
+            data.capsules.insert(capsule[0], capsule[1])
+
+    def consume(self, position, undo):
+        "Eats the food or capsule at position; returns the change of the score"
+        data = self.data
+        scoreChange = 0
+        x, y = position
+        if data.food[x][y]:
+            data.food[x][y] = False
+            self.numFood -= 1
+            self.foodKey ^= self.foodKeys[x][y]
+            undo[4] = position
+            scoreChange += 10
+            if self.numFood == 0 and not data._lose:
+                scoreChange += 500
+                data._win = True
+        if position in data.capsules:
+            capsuleIndex = data.capsules.index(position)
+            del data.capsules[capsuleIndex]
+            undo[5] = (capsuleIndex, position)
+            changed = undo[3]
+            for index in range(1, len(data.agentStates)):
+                ghostState = data.agentStates[index]
+                changed.append((index, ghostState.configuration, ghostState.scaredTimer))
+                ghostState.scaredTimer = SCARED_TIME
+        return scoreChange
+
+    def checkDeath(self, index, changed):
+        "Resolves a collision of Pacman with ghost index; returns the change of the score"
+        data = self.data
+        ghostState = data.agentStates[index]
+        if not GhostRules.canKill(data.agentStates[0].getPosition(), ghostState.getPosition()):
+            return 0
+        if ghostState.scaredTimer > 0:
+            changed.append((index, ghostState.configuration, ghostState.scaredTimer))
+            ghostState.configuration = ghostState.start
+            ghostState.scaredTimer = 0
+            return 200
+        if not data._win:
+            data._lose = True
+            return -500
+        return 0
+
+    def key(self):
+        "A hashable value that is equal for equal positions (as GameState.__eq__)"
+        return (self.foodKey, tuple(self.data.capsules), self.data.score,
+                tuple([(s.configuration.pos, s.configuration.direction, s.scaredTimer)
+                       for s in self.data.agentStates]))
+
+    def snapshot(self):
+        "An ordinary GameState equal to the current position"
+        state = GameState()
+        # the layout never changes and can be shared; the food grid cannot
+        state.data = GameStateData(self.data)
+        state.data.food = self.data.food.deepCopy()
+        state.data._win = self.data._win
+        state.data._lose = self.data._lose
+        return state
+
+    def getNumFood(self):
+        return self.numFood
+
+    def generateSuccessor(self, agentIndex, action):
+        # a regular successor would share the food grid, which changes in place
+        return self.snapshot().generateSuccessor(agentIndex, action)
+
+    def generateSuccessorFast(self, agentIndex, action):
+        return self.snapshot().generateSuccessorFast(agentIndex, action)
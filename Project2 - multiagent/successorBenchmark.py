@@ -0,0 +1,126 @@
+# successorBenchmark.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Microbenchmark of GameState successor generation.  Random games are played on
+each layout to collect a sample of states; then every successor of every one
+of them is generated with GameState.generateSuccessor, with
+GameState.generateSuccessorFast and by makeMove and unmakeMove on a
+SearchState (searchState.py), and the successors per second of each are
+printed.  Each fast and in place successor is also compared with the regular
+one, so the benchmark doubles as a check that they agree.
+
+  python successorBenchmark.py
+  python successorBenchmark.py -l mediumClassic,originalClassic -n 500
+"""
+
+import random
+import sys
+import time
+import layout
+import pacman
+import searchState
+
+def sampleStates(layoutName, numStates, seed):
+    "States met by agents that all move at random, restarting after a game ends"
+    lay = layout.getLayout(layoutName)
+    if lay == None: raise Exception("The layout " + layoutName + " cannot be found")
+    random.seed(seed)
+    states = []
+    while len(states) < numStates:
+        state = pacman.GameState()
+        state.initialize(lay, lay.getNumGhosts())
+        agent = 0
+        while not state.isWin() and not state.isLose() and len(states) < numStates:
+            states.append((state, agent))
+            state = state.generateSuccessor(agent, random.choice(state.getLegalActions(agent)))
+            agent = (agent + 1) % state.getNumAgents()
+    return states
+
+def successorsPerSecond(states, generate, repeats):
+    "How many successors per second generate(state, agent, action) makes"
+    work = [(state, agent, state.getLegalActions(agent)) for state, agent in states]
+    count = 0
+    start = time.time()
+    for i in range(repeats):
+        for state, agent, actions in work:
+            for action in actions:
+                generate(state, agent, action)
+                count += 1
+    return count / (time.time() - start)
+
+def inPlaceMovesPerSecond(states, repeats):
+    "How many moves per second makeMove and unmakeMove make and take back"
+    work = [(searchState.SearchState(state), agent, state.getLegalActions(agent)) for state, agent in states]
+    count = 0
+    start = time.time()
+    for i in range(repeats):
+        for state, agent, actions in work:
+            for action in actions:
+                state.unmakeMove(state.makeMove(agent, action))
+                count += 1
+    return count / (time.time() - start)
+
+def checkAgreement(states):
+    "Raises an exception if a fast or in place successor differs from the regular one"
+    for state, agent in states:
+        inPlace = searchState.SearchState(state)
+        for action in state.getLegalActions(agent):
+            slow = state.generateSuccessor(agent, action)
+            fast = state.generateSuccessorFast(agent, action)
+            if not slow == fast or slow.isWin() != fast.isWin() or slow.isLose() != fast.isLose():
+                raise Exception('generateSuccessorFast differs after %s by agent %d:\n%s' % (action, agent, state))
+            undo = inPlace.makeMove(agent, action)
+            if not slow == inPlace.snapshot() or slow.isWin() != inPlace.isWin() or slow.isLose() != inPlace.isLose():
+                raise Exception('SearchState.makeMove differs after %s by agent %d:\n%s' % (action, agent, state))
+            inPlace.unmakeMove(undo)
+            if not inPlace.snapshot() == state:
+                raise Exception('SearchState.unmakeMove did not restore the state after %s by agent %d:\n%s'
+                                % (action, agent, state))
+
+def runBenchmark(layoutNames, numStates, repeats, seed):
+    widths = [18, 14, 14, 8, 14, 8]
+    print('  '.join([column.ljust(width) for column, width in
+                     zip(['layout', 'regular/sec', 'fast/sec', 'speedup', 'inplace/sec', 'speedup'], widths)]))
+    for layoutName in layoutNames:
+        states = sampleStates(layoutName, numStates, seed)
+        checkAgreement(states)
+        pacman.GameState.getAndResetExplored()
+        regular = successorsPerSecond(states, lambda s, i, a: s.generateSuccessor(i, a), repeats)
+        pacman.GameState.getAndResetExplored()
+        fast = successorsPerSecond(states, lambda s, i, a: s.generateSuccessorFast(i, a), repeats)
+        inPlace = inPlaceMovesPerSecond(states, repeats)
+        row = [layoutName, '%.0f' % regular, '%.0f' % fast, '%.2fx' % (fast / regular),
+               '%.0f' % inPlace, '%.2fx' % (inPlace / regular)]
+        print('  '.join([str(column).ljust(width) for column, width in zip(row, widths)]))
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser('USAGE:      python successorBenchmark.py <options>')
+    parser.add_option('-l', '--layouts', dest='layouts', default='smallClassic,mediumClassic,originalClassic',
+                      help='comma separated LAYOUTS to sample states from [Default: %default]')
+    parser.add_option('-n', '--numStates', dest='numStates', type='int', default=300,
+                      help='number of sampled states per layout [Default: %default]')
+    parser.add_option('-r', '--repeats', dest='repeats', type='int', default=5,
+                      help='number of passes over the sampled states [Default: %default]')
+    parser.add_option('-s', '--seed', dest='seed', type='int', default=1,
+                      help='random seed for the sampled games [Default: %default]')
+    options, args = parser.parse_args(argv)
+    if len(args) != 0:
+        parser.error('Command line input not understood: ' + str(args))
+    return options
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    runBenchmark(options.layouts.split(','), options.numStates, options.repeats, options.seed)
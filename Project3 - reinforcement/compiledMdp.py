@@ -0,0 +1,439 @@
+# compiledMdp.py
+# --------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Markov decision processes compiled into arrays, and value iteration over them.
+
+ValueIterationAgent asks the mdp for the transitions and the rewards of every
+state and action on every sweep, although they never change.  A CompiledMDP
+asks once.  The states are numbered in getStates order and every action of a
+state that is not terminal becomes a row, which keeps the expected reward of
+the action and its transition probabilities to the numbered next states.  The
+rows of a state are consecutive and in getPossibleActions order.
+
+A Bellman sweep over the compiled model is then two array operations:
+
+  Q = R + discount * P V                 one Q-value per row
+  V'[s] = max of Q over the rows of s    0 for states without rows
+
+With scipy, P is a sparse CSR matrix; with numpy alone the product is one
+numpy.bincount over the nonzero entries of P; without either, the values are
+lists and the sweep is a loop over the rows.  All three give the same values.
+
+  compiled = CompiledMDP(mdp)
+  values, sweeps = valueIteration(compiled, 0.9, 1000, tolerance=1e-6)
+  compiled.valueCounter(values)[state]
+
+Value iteration can also back up one state at a time, in place, so a backup
+already sees the values updated before it in the same sweep (Gauss-Seidel,
+gaussSeidelValueIteration), or always back up the state whose value is
+furthest from its backup, with the states that lead to a changed state
+queued again (prioritizedSweeping).  These work on lists, since one state at
+a time is faster with Python numbers than with numpy scalars.
+
+policyIteration alternates evaluating a policy, a row for every state, with
+making it greedy.  The evaluation solves the linear system of the policy
+exactly (a sparse solve with scipy, a dense one with numpy alone) or runs a
+few sweeps of it from the last values (modified policy iteration).
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+try:
+    import scipy.sparse
+    import scipy.sparse.linalg
+except ImportError:
+    scipy = None
+
+import util
+
+class CompiledMDP:
+    """
+    The transitions and rewards of an mdp, indexed by integers:
+
+      states[s]           the state numbered s; index[state] == s
+      actions[s]          the actions of the rows of s (none if s is terminal)
+      firstRow[s]         the first row of s; its rows end at firstRow[s + 1]
+      rowState[r]         the state of row r
+      rewards[r]          the expected reward of row r
+      transitions[r]      the (next state number, probability) pairs of row r
+      activeStates        the numbers of the states with at least one row
+
+    With numpy the same model is also kept as arrays (rewardArray,
+    rowStateArray, and the nonzero entries of P as entryRows, entryStates and
+    entryProbs), and with scipy as the sparse matrix P.  The mdp itself is not
+    kept: changing its noise or living reward afterwards does not change the
+    compiled model.
+    """
+    def __init__(self, mdp):
+        self.states = list(mdp.getStates())
+        self.index = dict([(state, s) for s, state in enumerate(self.states)])
+        self.actions = []
+        self.firstRow = []
+        self.rowState = []
+        self.rewards = []
+        self.transitions = []
+        for s, state in enumerate(self.states):
+            self.firstRow.append(len(self.rowState))
+            actions = []
+            if not mdp.isTerminal(state):
+                actions = list(mdp.getPossibleActions(state))
+            self.actions.append(actions)
+            for action in actions:
+                reward = 0.0
+                row = []
+                for nextState, prob in mdp.getTransitionStatesAndProbs(state, action):
+                    if prob == 0: continue
+                    reward += prob * mdp.getReward(state, action, nextState)
+                    row.append((self.index[nextState], prob))
+                self.rowState.append(s)
+                self.rewards.append(reward)
+                self.transitions.append(row)
+        self.firstRow.append(len(self.rowState))
+        self.numStates = len(self.states)
+        self.numRows = len(self.rowState)
+        self.activeStates = [s for s in range(self.numStates) if self.firstRow[s] < self.firstRow[s + 1]]
+        self.predecessors = None
+        if numpy != None:
+            self.compileArrays()
+
+    def compileArrays(self):
+        entries = [(r, n, prob) for r, row in enumerate(self.transitions) for n, prob in row]
+        self.entryRows = numpy.array([e[0] for e in entries], dtype=int)
+        self.entryStates = numpy.array([e[1] for e in entries], dtype=int)
+        self.entryProbs = numpy.array([e[2] for e in entries], dtype=float)
+        self.rewardArray = numpy.array(self.rewards, dtype=float)
+        self.rowStateArray = numpy.array(self.rowState, dtype=int)
+        counts = numpy.diff(numpy.array(self.firstRow, dtype=int))
+        # states with at least one row, and where their rows start
+        self.hasRows = counts > 0
+        self.rowStarts = numpy.array(self.firstRow[:-1], dtype=int)[self.hasRows]
+        self.matrix = None
+        if scipy != None:
+            self.matrix = scipy.sparse.csr_matrix((self.entryProbs, (self.entryRows, self.entryStates)),
+                                                  shape=(self.numRows, self.numStates))
+
+    def zeros(self):
+        "A value of 0 for every state"
+        if numpy != None:
+            return numpy.zeros(self.numStates)
+        return [0.0] * self.numStates
+
+    def vector(self, values):
+        "The values of a dictionary keyed by state (missing states are 0), in state order"
+        vector = [float(values.get(state, 0.0)) for state in self.states]
+        if numpy != None:
+            return numpy.array(vector)
+        return vector
+
+    def toList(self, values):
+        "A value vector as a list"
+        if numpy != None:
+            return values.tolist()
+        return list(values)
+
+    def fromList(self, values):
+        "A list of values as a value vector"
+        if numpy != None:
+            return numpy.array(values, dtype=float)
+        return values
+
+    def valueCounter(self, values):
+        "A util.Counter from state to value"
+        if numpy != None:
+            values = values.tolist()
+        counter = util.Counter()
+        for state, value in zip(self.states, values):
+            counter[state] = value
+        return counter
+
+    def row(self, state, action):
+        "The row of action in state, or None if the state has no such row"
+        s = self.index.get(state)
+        if s == None or action not in self.actions[s]:
+            return None
+        return self.firstRow[s] + self.actions[s].index(action)
+
+    def getPredecessors(self):
+        """
+        For every state, the numbers of the states that reach it with some
+        action (with a probability above 0), in state order.  Built the first
+        time it is asked for.
+        """
+        if self.predecessors == None:
+            predecessors = [set() for s in range(self.numStates)]
+            for r, row in enumerate(self.transitions):
+                for n, prob in row:
+                    predecessors[n].add(self.rowState[r])
+            self.predecessors = [sorted(states) for states in predecessors]
+        return self.predecessors
+
+    def backup(self, s, values, discount):
+        "The Bellman backup of state s on a list of values: its highest Q-value, 0 without rows"
+        best = None
+        for r in range(self.firstRow[s], self.firstRow[s + 1]):
+            q = self.rewards[r] + discount * sum([prob * values[n] for n, prob in self.transitions[r]])
+            if best == None or q > best:
+                best = q
+        if best == None:
+            return 0.0
+        return best
+
+    def expectedValues(self, values):
+        "P V: the expected value of the next state, for every row"
+        if numpy == None:
+            return [sum([prob * values[n] for n, prob in row]) for row in self.transitions]
+        if self.matrix is not None:
+            return self.matrix.dot(values)
+        return numpy.bincount(self.entryRows, weights=self.entryProbs * values[self.entryStates],
+                              minlength=self.numRows)
+
+    def qValues(self, values, discount):
+        "R + discount * P V: the Q-value of every row"
+        expected = self.expectedValues(values)
+        if numpy == None:
+            return [reward + discount * value for reward, value in zip(self.rewards, expected)]
+        return self.rewardArray + discount * expected
+
+    def maxQValues(self, qValues):
+        "The highest Q-value of every state, or 0 if it has no rows"
+        if numpy == None:
+            first = self.firstRow
+            return [max(qValues[first[s]:first[s + 1]] or [0.0]) for s in range(self.numStates)]
+        values = numpy.zeros(self.numStates)
+        if self.numRows > 0:
+            values[self.hasRows] = numpy.maximum.reduceat(qValues, self.rowStarts)
+        return values
+
+    def bellman(self, values, discount):
+        "One synchronous Bellman sweep: the new value of every state"
+        return self.maxQValues(self.qValues(values, discount))
+
+    def greedyRows(self, qValues):
+        """
+        The row with the highest Q-value of every state, the first one in
+        getPossibleActions order on ties, or -1 if the state has no rows.
+        """
+        if numpy == None:
+            rows = []
+            for s in range(self.numStates):
+                best = -1
+                for r in range(self.firstRow[s], self.firstRow[s + 1]):
+                    if best == -1 or qValues[r] > qValues[best]:
+                        best = r
+                rows.append(best)
+            return rows
+        rows = -numpy.ones(self.numStates, dtype=int)
+        if self.numRows > 0:
+            maxima = self.maxQValues(qValues)
+            candidates = numpy.flatnonzero(qValues >= maxima[self.rowStateArray])
+            # the candidates are sorted, so the first one of each state wins
+            owners, first = numpy.unique(self.rowStateArray[candidates], return_index=True)
+            rows[owners] = candidates[first]
+        return rows
+
+# A policy only switches to an action whose Q-value is higher by more than
+# this, so rounding cannot make policy iteration go back and forth
+POLICY_IMPROVEMENT = 1e-10
+
+def policyQValues(compiled, qValues, rows):
+    "The Q-value of the policy row of every state, or 0 for states without rows"
+    if numpy == None:
+        return [(row >= 0) and qValues[row] or 0.0 for row in rows]
+    values = numpy.zeros(compiled.numStates)
+    active = rows >= 0
+    values[active] = qValues[rows[active]]
+    return values
+
+def evaluatePolicy(compiled, rows, discount, sweeps=None, values=None):
+    """
+    The values of the policy that takes row rows[s] in every state s.  With
+    sweeps None they are solved for; otherwise they are the values after
+    that many sweeps of the policy's Bellman equation from values.  Without
+    numpy, solving means sweeping until no value changes by more than 1e-12.
+    Solving needs a discount below 1: undiscounted, a policy that never
+    reaches an exit has no finite values.
+    """
+    if sweeps == None and discount >= 1:
+        raise Exception('policy evaluation needs a discount below 1, not %s' % discount)
+    if values is None:
+        values = compiled.zeros()
+    if sweeps != None or numpy == None:
+        done = 0
+        while sweeps == None or done < sweeps:
+            newValues = policyQValues(compiled, compiled.qValues(values, discount), rows)
+            done += 1
+            change = maxDifference(newValues, values)
+            values = newValues
+            if sweeps == None and change <= 1e-12:
+                break
+        return values
+    # (I - discount * P_policy) V = R_policy, with V = 0 for states without rows
+    n = compiled.numStates
+    chosen = numpy.zeros(compiled.numRows, dtype=bool)
+    chosen[rows[rows >= 0]] = True
+    entries = chosen[compiled.entryRows]
+    stateOf = compiled.rowStateArray[compiled.entryRows[entries]]
+    nextOf = compiled.entryStates[entries]
+    probs = compiled.entryProbs[entries]
+    rewards = policyQValues(compiled, compiled.rewardArray, rows)
+    if scipy != None:
+        transitions = scipy.sparse.csr_matrix((probs, (stateOf, nextOf)), shape=(n, n))
+        system = (scipy.sparse.identity(n, format='csr') - discount * transitions).tocsc()
+        return scipy.sparse.linalg.spsolve(system, rewards)
+    system = numpy.identity(n)
+    numpy.add.at(system, (stateOf, nextOf), -discount * probs)
+    return numpy.linalg.solve(system, rewards)
+
+def improvePolicy(compiled, qValues, rows):
+    "The greedy policy for qValues, keeping the row of rows where no other is clearly better"
+    greedy = compiled.greedyRows(qValues)
+    if numpy == None:
+        improved = []
+        for old, new in zip(rows, greedy):
+            if old >= 0 and qValues[new] - qValues[old] <= POLICY_IMPROVEMENT:
+                new = old
+            improved.append(new)
+        return improved
+    if compiled.numRows == 0:
+        return greedy
+    keep = (rows >= 0) & (qValues[greedy] - qValues[rows] <= POLICY_IMPROVEMENT)
+    return numpy.where(keep, rows, greedy)
+
+def samePolicy(rows, otherRows):
+    if numpy == None:
+        return rows == otherRows
+    return bool((rows == otherRows).all())
+
+def policyIteration(compiled, discount, iterations=None, evaluationSweeps=None, tolerance=None):
+    """
+    Policy iteration on a CompiledMDP, starting from the policy that is
+    greedy for the immediate rewards.  Every round evaluates the policy
+    (see evaluatePolicy; evaluationSweeps None solves for its values) and
+    makes it greedy for the new values.  Stops when the policy no longer
+    changes, or after 'iterations' rounds.  With evaluationSweeps, modified
+    policy iteration, the values of a policy are only approached, so it also
+    runs until a round changes no value by more than tolerance (0 if None).
+    The discount must be below 1, or the values of a policy that never
+    reaches an exit grow without end.
+
+    Returns the values, the policy rows and the number of rounds.
+    """
+    if discount >= 1:
+        raise Exception('policy iteration needs a discount below 1, not %s' % discount)
+    values = compiled.zeros()
+    rows = compiled.greedyRows(compiled.qValues(values, discount))
+    rounds = 0
+    while iterations == None or rounds < iterations:
+        newValues = evaluatePolicy(compiled, rows, discount, evaluationSweeps, values)
+        newRows = improvePolicy(compiled, compiled.qValues(newValues, discount), rows)
+        rounds += 1
+        stable = samePolicy(newRows, rows)
+        change = maxDifference(newValues, values)
+        values, rows = newValues, newRows
+        if stable and (evaluationSweeps == None or change <= (tolerance or 0.0)):
+            break
+    return values, rows, rounds
+
+def maxDifference(values, otherValues):
+    "The largest change of any value between two value vectors"
+    if numpy == None:
+        return max([abs(a - b) for a, b in zip(values, otherValues)] or [0.0])
+    if len(values) == 0:
+        return 0.0
+    return float(numpy.abs(values - otherValues).max())
+
+def valueIteration(compiled, discount, iterations=None, tolerance=None, values=None):
+    """
+    Runs synchronous value iteration on a CompiledMDP from values (all 0 by
+    default) and returns the values and the number of sweeps done.  Stops
+    after 'iterations' sweeps, or earlier once a sweep changes no value by
+    more than tolerance; at least one of the two must be given.
+    """
+    if iterations == None and tolerance == None:
+        raise Exception('value iteration needs a number of iterations or a tolerance')
+    if values is None:
+        values = compiled.zeros()
+    sweeps = 0
+    while iterations == None or sweeps < iterations:
+        newValues = compiled.bellman(values, discount)
+        sweeps += 1
+        change = maxDifference(newValues, values)
+        values = newValues
+        if tolerance != None and change <= tolerance:
+            break
+    return values, sweeps
+
+def gaussSeidelValueIteration(compiled, discount, iterations=None, tolerance=None, values=None):
+    """
+    Runs value iteration in place: each sweep backs up the states in order,
+    and every backup uses the newest values of the others.  Stops as
+    valueIteration does and returns the values, the number of sweeps and
+    the number of state backups done.
+    """
+    if iterations == None and tolerance == None:
+        raise Exception('value iteration needs a number of iterations or a tolerance')
+    if values is None:
+        values = compiled.zeros()
+    values = compiled.toList(values)
+    sweeps = backups = 0
+    while iterations == None or sweeps < iterations:
+        change = 0.0
+        for s in compiled.activeStates:
+            value = compiled.backup(s, values, discount)
+            change = max(change, abs(value - values[s]))
+            values[s] = value
+        sweeps += 1
+        backups += len(compiled.activeStates)
+        if tolerance != None and change <= tolerance:
+            break
+    return compiled.fromList(values), sweeps, backups
+
+def prioritizedSweeping(compiled, discount, iterations=None, tolerance=0.0, values=None):
+    """
+    Backs up one state at a time, always the state whose value is furthest
+    from its Bellman backup (its Bellman error), until no error is above
+    tolerance or after 'iterations' backups.  A backup can only change the
+    errors of the predecessors of the state, so only those are computed
+    again.  Returns the values and the number of backups done.
+    """
+    if values is None:
+        values = compiled.zeros()
+    values = compiled.toList(values)
+    predecessors = compiled.getPredecessors()
+    # the queue may hold old entries of a state; errors has the current one
+    queue = util.PriorityQueue()
+    errors = {}
+    def check(s):
+        error = abs(compiled.backup(s, values, discount) - values[s])
+        if error > tolerance:
+            errors[s] = error
+            queue.push((s, error), -error)
+        elif s in errors:
+            del errors[s]
+    for s in compiled.activeStates:
+        check(s)
+    backups = 0
+    while not queue.isEmpty() and (iterations == None or backups < iterations):
+        s, error = queue.pop()
+        if errors.get(s) != error:
+            continue
+        del errors[s]
+        values[s] = compiled.backup(s, values, discount)
+        backups += 1
+        for p in predecessors[s]:
+            check(p)
+    return compiled.fromList(values), backups
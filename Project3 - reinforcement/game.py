@@ -368,6 +368,97 @@ class Actions:
         return (x + dx, y + dy)
     getSuccessor = staticmethod(getSuccessor)
 
+MOVE_TABLES = {}
+
+def getMoveTable(walls):
+    "The MoveTable of a maze, built once for every distinct walls Grid"
+    if walls not in MOVE_TABLES:
+        MOVE_TABLES[walls] = MoveTable(walls)
+    return MOVE_TABLES[walls]
+
+class MoveTable:
+    """
+    The moves the walls of a maze allow from every open position, computed
+    once so the game rules and the search problems look them up instead of
+    testing the walls around an agent at every step.  Use getMoveTable(walls)
+    or Layout.getMoveTable() to get the shared table of a maze.
+
+    getPossibleActions, getGhostActions and getLegalNeighbors answer exactly
+    as Actions.getPossibleActions, GhostRules.getLegalActions and
+    Actions.getLegalNeighbors would, in the same order, and return new lists
+    the caller may change.  Positions that are not in the table (between grid
+    points, as for ghosts moving at half speed) are worked out as before.
+    """
+    SEARCH_DIRECTIONS = [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]
+
+    def __init__(self, walls):
+        self.walls = walls
+        self.actions = {}
+        self.ghostActions = {}
+        self.neighbors = {}
+        self.successors = {}
+        for x in range(walls.width):
+            for y in range(walls.height):
+                if walls[x][y]: continue
+                position = (x, y)
+                actions = Actions.getPossibleActions(Configuration(position, Directions.STOP), walls)
+                self.actions[position] = tuple(actions)
+                for direction in Actions._directions:
+                    self.ghostActions[(position, direction)] = tuple(MoveTable.ghostFilter(actions, direction))
+                self.neighbors[position] = tuple(Actions.getLegalNeighbors(position, walls))
+                self.successors[position] = self.computeSuccessors(position)
+
+    def ghostFilter(actions, direction):
+        """
+        Ghosts cannot stop, and cannot turn around unless they
+        reach a dead end, but can turn 90 degrees at intersections.
+        """
+        possibleActions = [action for action in actions if action != Directions.STOP]
+        reverse = Actions.reverseDirection(direction)
+        if reverse in possibleActions and len(possibleActions) > 1:
+            possibleActions.remove(reverse)
+        return possibleActions
+    ghostFilter = staticmethod(ghostFilter)
+
+    def computeSuccessors(self, position):
+        x, y = position
+        successors = []
+        for action in MoveTable.SEARCH_DIRECTIONS:
+            dx, dy = Actions._directions[action]
+            nextx, nexty = int(x + dx), int(y + dy)
+            if not self.walls[nextx][nexty]:
+                successors.append(((nextx, nexty), action))
+        return tuple(successors)
+
+    def getPossibleActions(self, config):
+        actions = self.actions.get(config.pos)
+        if actions == None:
+            return Actions.getPossibleActions(config, self.walls)
+        return list(actions)
+
+    def getGhostActions(self, config):
+        actions = self.ghostActions.get((config.pos, config.direction))
+        if actions == None:
+            return MoveTable.ghostFilter(Actions.getPossibleActions(config, self.walls), config.direction)
+        return list(actions)
+
+    def getLegalNeighbors(self, position):
+        neighbors = self.neighbors.get(position)
+        if neighbors == None:
+            return Actions.getLegalNeighbors(position, self.walls)
+        return list(neighbors)
+
+    def getSuccessors(self, position):
+        """
+        The (nextPosition, action) pairs of the moves from an integer position
+        that do not hit a wall, in the North, South, East, West order of the
+        search problems.  The result is a tuple shared by all callers.
+        """
+        successors = self.successors.get(position)
+        if successors == None:
+            return self.computeSuccessors(position)
+        return successors
+
 class GameStateData:
     """
 
@@ -377,6 +377,27 @@ def runEpisode(agent, environment, discount, decision, display, message, pause,
     if 'stopEpisode' in dir(agent):
         agent.stopEpisode()
 
+# The -a options of the agents that solve the mdp with its model
+VALUE_AGENTS = ['value', 'compiled', 'async', 'prioritized', 'policy', 'mpi']
+
+def getValueAgent(name, mdp, discount, iterations, tolerance=None, compiled=None, evaluationSweeps=5):
+    """
+    The value agent of -a option name.  Iterations are sweeps, except for
+    'prioritized', which counts single state backups, and 'policy' and
+    'mpi', which count rounds of policy iteration.
+    """
+    import valueIterationAgents
+    if name == 'value':
+        return valueIterationAgents.ValueIterationAgent(mdp, discount, iterations)
+    if name == 'mpi':
+        return valueIterationAgents.ModifiedPolicyIterationAgent(mdp, discount, iterations, tolerance, compiled,
+                                                                  evaluationSweeps)
+    agentClass = {'compiled': valueIterationAgents.CompiledValueIterationAgent,
+                  'async': valueIterationAgents.AsynchronousValueIterationAgent,
+                  'prioritized': valueIterationAgents.PrioritizedSweepingValueIterationAgent,
+                  'policy': valueIterationAgents.PolicyIterationAgent}[name]
+    return agentClass(mdp, discount, iterations, tolerance, compiled)
+
 def parseOptions():
     optParser = optparse.OptionParser()
     optParser.add_option('-d', '--discount',action='store',
@@ -398,6 +419,12 @@ def parseOptions():
     optParser.add_option('-i', '--iterations',action='store',
                          type='int',dest='iters',default=10,
                          metavar="K", help='Number of rounds of value iteration (default %default)')
+    optParser.add_option('--tolerance',action='store',
+                         type='float',dest='tolerance',default=None,
+                         metavar="T", help='Stop value iteration once no value changes by more than T (compiled, async, prioritized and mpi agents)')
+    optParser.add_option('--evaluationSweeps',action='store',
+                         type='int',dest='evaluationSweeps',default=5,
+                         metavar="K", help='Sweeps of policy evaluation per round of modified policy iteration (default %default)')
     optParser.add_option('-k', '--episodes',action='store',
                          type='int',dest='episodes',default=1,
                          metavar="K", help='Number of epsiodes of the MDP to run (default %default)')
@@ -408,7 +435,7 @@ def parseOptions():
                          help='Request a window width of X pixels *per grid cell* (default %default)')
     optParser.add_option('-a', '--agent',action='store', metavar="A",
                          type='string',dest='agent',default="random",
-                         help='Agent type (options are \'random\', \'value\' and \'q\', default %default)')
+                         help='Agent type (options are \'random\', \'value\', \'compiled\', \'async\', \'prioritized\', \'policy\', \'mpi\' and \'q\', default %default)')
     optParser.add_option('-t', '--text',action='store_true',
                          dest='textDisplay',default=False,
                          help='Use text-only ASCII display')
@@ -481,8 +508,13 @@ if __name__ == '__main__':
 
     import valueIterationAgents, qlearningAgents
     a = None
-    if opts.agent == 'value':
-        a = valueIterationAgents.ValueIterationAgent(mdp, opts.discount, opts.iters)
+    if opts.agent in VALUE_AGENTS:
+        a = getValueAgent(opts.agent, mdp, opts.discount, opts.iters, opts.tolerance,
+                          evaluationSweeps=opts.evaluationSweeps)
+        if getattr(a, 'backups', None) != None:
+            print 'STATE BACKUPS PERFORMED:', a.backups
+        if getattr(a, 'rounds', None) != None:
+            print 'POLICY ITERATION ROUNDS:', a.rounds
     elif opts.agent == 'q':
         #env.getPossibleActions, opts.discount, opts.learningRate, opts.epsilon
         #simulationFn = lambda agent, state: simulation.GridworldSimulation(agent,state,mdp)
@@ -519,10 +551,11 @@ if __name__ == '__main__':
     ###########################
     # DISPLAY Q/V VALUES BEFORE SIMULATION OF EPISODES
     try:
-        if not opts.manual and opts.agent == 'value':
+        if not opts.manual and opts.agent in VALUE_AGENTS:
             if opts.valueSteps:
                 for i in range(opts.iters):
-                    tempAgent = valueIterationAgents.ValueIterationAgent(mdp, opts.discount, i)
+                    tempAgent = getValueAgent(opts.agent, mdp, opts.discount, i, opts.tolerance,
+                                              getattr(a, 'compiled', None), opts.evaluationSweeps)
                     display.displayValues(tempAgent, message = "VALUES AFTER "+str(i)+" ITERATIONS")
                     display.pause()
 
@@ -542,7 +575,7 @@ if __name__ == '__main__':
             displayCallback = lambda state: display.displayNullValues(state)
         else:
             if opts.agent == 'random': displayCallback = lambda state: display.displayValues(a, state, "CURRENT VALUES")
-            if opts.agent == 'value': displayCallback = lambda state: display.displayValues(a, state, "CURRENT VALUES")
+            if opts.agent in VALUE_AGENTS: displayCallback = lambda state: display.displayValues(a, state, "CURRENT VALUES")
             if opts.agent == 'q': displayCallback = lambda state: display.displayQValues(a, state, "CURRENT Q-VALUES")
 
     messageCallback = lambda x: printString(x)
@@ -0,0 +1,241 @@
+# gridworldBenchmark.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Runs the gridworld agents headless on the named grids and on generated grids
+of growing size, and reports how fast they are:
+
+  python gridworldBenchmark.py -s 10,20,40 --seeds 0,1 -o report.json
+
+The value agents (the -a options of gridworld.py) run until their values are
+within the tolerance, policy iteration until its policy is stable.
+ValueIterationAgent, which cannot tell when it has converged, runs as many
+sweeps as the compiled agent needed.  The time includes compiling the mdp.
+The q-learning agent ('q', or 'qarray' with its Q-values in an array, see
+qTables.py) plays a number of episodes, each cut off after a number of steps
+(cutOff counts those); one step is one backup.
+
+Every agent on every grid runs in a fresh process, so the memory it reports
+is its own: memoryKB is how much the peak resident size of the process grew
+while the agent ran, peakMemoryKB the peak itself (kilobytes on Linux, as
+getrusage reports them).  The error is the largest difference from the
+values of a much longer run of value iteration; for the q-learning
+agents it is the difference at the start state.
+
+The report, written with -o, is JSON: the settings, the versions, and one
+record per agent and grid, so runs can be compared over time.
+"""
+
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import time
+import compiledMdp
+import gridworld
+import gridworldGenerator
+import qlearningAgents
+# gridworld imports it on the first value agent; imported here, before the
+# workers fork, so that import does not count as the memory of the agent
+import valueIterationAgents
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def peakMemory():
+    "The peak resident size of this process so far, or None where getrusage is missing"
+    if resource == None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def benchmarkGrids(options):
+    "A description of every grid to run the agents on, named grids first"
+    grids = [{'name': name} for name in options.named]
+    for size in options.sizes:
+        for seed in options.seeds:
+            grids.append({'name': 'Generated%dx%d' % (size, size), 'width': size, 'height': size,
+                          'wallDensity': options.wallDensity, 'exits': options.exits,
+                          'placement': options.placement, 'seed': seed})
+    return grids
+
+def makeGrid(grid, options):
+    "The Gridworld of a grid description"
+    if 'width' in grid:
+        return gridworldGenerator.generateGrid(grid['width'], grid['height'], grid['wallDensity'], grid['exits'],
+                                               grid['placement'], grid['seed'], options.noise,
+                                               options.livingReward)
+    mdp = getattr(gridworld, 'get' + grid['name'])()
+    mdp.setNoise(options.noise)
+    mdp.setLivingReward(options.livingReward)
+    return mdp
+
+def runValueAgent(name, mdp, options, sweeps):
+    "Solves mdp with the value agent of -a option name; returns the agent and the measures"
+    iterations = None
+    if name == 'value':
+        iterations = sweeps
+    start = time.time()
+    agent = gridworld.getValueAgent(name, mdp, options.discount, iterations, options.tolerance,
+                                    evaluationSweeps=options.evaluationSweeps)
+    seconds = time.time() - start
+    measures = {'seconds': seconds, 'sweeps': getattr(agent, 'sweeps', iterations),
+                'backups': getattr(agent, 'backups', None), 'rounds': getattr(agent, 'rounds', None)}
+    if name == 'value':
+        measures['backups'] = sweeps * len([s for s in mdp.getStates() if not mdp.isTerminal(s)])
+    return agent, measures
+
+def runLearningAgent(mdp, options, qTable='counter'):
+    "Plays the q-learning episodes on mdp; returns the agent and the measures"
+    environment = gridworld.GridworldEnvironment(mdp)
+    agent = qlearningAgents.QLearningAgent(gamma=options.discount, alpha=options.learningRate,
+                                           epsilon=options.epsilon, numTraining=options.episodes, qTable=qTable,
+                                           actionFn=lambda state: mdp.getPossibleActions(state))
+    steps = cutOff = 0
+    start = time.time()
+    for episode in range(options.episodes):
+        environment.reset()
+        agent.startEpisode()
+        for step in range(options.maxSteps):
+            state = environment.getCurrentState()
+            if len(environment.getPossibleActions(state)) == 0:
+                break
+            action = agent.getAction(state)
+            nextState, reward = environment.doAction(action)
+            agent.observeTransition(state, action, nextState, reward)
+            steps += 1
+        else:
+            cutOff += 1
+        agent.stopEpisode()
+    seconds = time.time() - start
+    return agent, {'seconds': seconds, 'episodes': options.episodes, 'cutOff': cutOff, 'backups': steps,
+                   'episodesPerSecond': options.episodes / max(seconds, 1e-9)}
+
+def runJob(job):
+    "Runs one agent on one grid and returns its record of the report"
+    grid, name, options = job
+    random.seed(options.randomSeed)
+    mdp = makeGrid(grid, options)
+    states = mdp.getStates()
+    compiled = compiledMdp.CompiledMDP(mdp)
+    sweeps = compiledMdp.valueIteration(compiled, options.discount, None, options.tolerance)[1]
+    before = peakMemory()
+    if name in ('q', 'qarray'):
+        agent, record = runLearningAgent(mdp, options, name == 'qarray' and 'array' or 'counter')
+        states = [mdp.getStartState()]
+    else:
+        agent, record = runValueAgent(name, mdp, options, sweeps)
+    after = peakMemory()
+    reference = compiledMdp.valueIteration(compiled, options.discount, None, options.tolerance * 1e-4)[0]
+    reference = compiled.valueCounter(reference)
+    record['error'] = max([abs(agent.getValue(state) - reference[state]) for state in states])
+    if record['backups'] == None:
+        del record['backups']
+    else:
+        record['backupsPerSecond'] = record['backups'] / max(record['seconds'], 1e-9)
+    if after != None:
+        record['memoryKB'] = after - before
+        record['peakMemoryKB'] = after
+    record.update({'agent': name, 'grid': grid, 'states': len(mdp.getStates())})
+    return record
+
+def runIsolated(job):
+    "Runs a job in a fresh worker process, so its memory is measured on its own"
+    pool = multiprocessing.Pool(1)
+    try:
+        return pool.apply(runJob, (job,))
+    finally:
+        pool.close()
+        pool.join()
+
+def runBenchmark(options):
+    report = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+              'numpy': compiledMdp.numpy != None, 'scipy': compiledMdp.scipy != None,
+              'settings': dict(vars(options)), 'results': []}
+    print '%-16s %4s %7s  %-12s %10s %10s %12s %9s %9s' % ('grid', 'seed', 'states', 'agent', 'seconds', 'backups',
+                                                           'backups/s', 'error', 'memoryKB')
+    for grid in benchmarkGrids(options):
+        for name in options.agents:
+            job = (grid, name, options)
+            if options.inProcess:
+                record = runJob(job)
+            else:
+                record = runIsolated(job)
+            report['results'].append(record)
+            print '%-16s %4s %7d  %-12s %10.4f %10s %12s %9.2e %9s' % (
+                grid['name'], grid.get('seed', '-'), record['states'], name, record['seconds'],
+                record.get('backups', '-'), '%.0f' % record['backupsPerSecond'] if 'backupsPerSecond' in record else '-',
+                record['error'],
+                record.get('memoryKB'))
+    if options.output != None:
+        with open(options.output, 'w') as out:
+            json.dump(report, out, indent=1, sort_keys=True)
+    return report
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser('python gridworldBenchmark.py <options>')
+    parser.add_option('-a', '--agents', dest='agents', default='value,compiled,async,prioritized,policy,mpi,q,qarray',
+                      help='comma separated -a options of gridworld.py [Default: %default]')
+    parser.add_option('-g', '--named', dest='named', default='BookGrid,MazeGrid',
+                      help='comma separated grids of gridworld.py [Default: %default]')
+    parser.add_option('-s', '--sizes', dest='sizes', default='10,20,40',
+                      help='comma separated sizes of the generated grids [Default: %default]')
+    parser.add_option('--seeds', dest='seeds', default='0',
+                      help='comma separated seeds, one generated grid of every size for each [Default: %default]')
+    parser.add_option('-w', '--wallDensity', dest='wallDensity', type='float', default=0.2,
+                      help='share of walls in the generated grids [Default: %default]')
+    parser.add_option('-e', '--exits', dest='exits', default='1,-1',
+                      help='comma separated exit rewards of the generated grids [Default: %default]')
+    parser.add_option('-p', '--placement', dest='placement', default='corner',
+                      help='exit placement, one of ' + ', '.join(gridworldGenerator.PLACEMENTS) +
+                           ' [Default: %default]')
+    parser.add_option('-n', '--noise', dest='noise', type='float', default=0.2,
+                      help='noise of every grid [Default: %default]')
+    parser.add_option('-r', '--livingReward', dest='livingReward', type='float', default=0.0,
+                      help='living reward of every grid [Default: %default]')
+    parser.add_option('-d', '--discount', dest='discount', type='float', default=0.9,
+                      help='discount [Default: %default]')
+    parser.add_option('-t', '--tolerance', dest='tolerance', type='float', default=1e-6,
+                      help='convergence tolerance of value iteration [Default: %default]')
+    parser.add_option('-k', '--evaluationSweeps', dest='evaluationSweeps', type='int', default=5,
+                      help='sweeps per round of modified policy iteration [Default: %default]')
+    parser.add_option('--episodes', dest='episodes', type='int', default=100,
+                      help='episodes of the q-learning agent [Default: %default]')
+    parser.add_option('--maxSteps', dest='maxSteps', type='int', default=10000,
+                      help='steps after which an episode is cut off [Default: %default]')
+    parser.add_option('--epsilon', dest='epsilon', type='float', default=0.3,
+                      help='exploration rate of the q-learning agent [Default: %default]')
+    parser.add_option('--learningRate', dest='learningRate', type='float', default=0.5,
+                      help='learning rate of the q-learning agent [Default: %default]')
+    parser.add_option('--randomSeed', dest='randomSeed', type='int', default=0,
+                      help='seed of the random moves of every run [Default: %default]')
+    parser.add_option('--inProcess', dest='inProcess', action='store_true', default=False,
+                      help='run everything in this process; the memory figures then add up')
+    parser.add_option('-o', '--output', dest='output', default=None,
+                      help='write the report as JSON to this file')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        parser.error('Command line input not understood: ' + str(otherjunk))
+    options.agents = options.agents.split(',')
+    options.named = [name for name in options.named.split(',') if name]
+    options.sizes = [int(size) for size in options.sizes.split(',') if size]
+    options.seeds = [int(seed) for seed in options.seeds.split(',') if seed]
+    options.exits = [int(reward) for reward in options.exits.split(',')]
+    return options
+
+if __name__ == '__main__':
+    runBenchmark(readCommand(sys.argv[1:]))
@@ -0,0 +1,122 @@
+# gridworldGenerator.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Random gridworlds of any size, for seeing how the agents scale.  The same
+arguments always give the same grid.
+
+  mdp = generateGrid(40, 40, wallDensity=0.25, exits=[1, -1, -1], placement='border', seed=3)
+
+The start is in the bottom left corner.  Walls are drawn cell by cell, and
+open cells that cannot be reached from the start are walled in, so every
+exit can be reached.  The exits are placed on open cells:
+
+  'random'   anywhere
+  'corner'   the first exit in the reachable cell furthest from the start
+             (by moves), the others anywhere
+  'border'   on the edge of the grid, where there is an open cell
+
+  python gridworldGenerator.py 20 10 -w 0.3 -s 1      prints a grid
+"""
+
+import random
+import sys
+import gridworld
+
+PLACEMENTS = ['random', 'corner', 'border']
+
+def generateRows(width, height, wallDensity=0.2, exits=(1, -1), placement='corner', seed=0):
+    """
+    The rows of a random grid, from the top, as gridworld.makeGrid takes
+    them: ' ' for open cells, '#' for walls, 'S' for the start and the exit
+    rewards (ints) for exits.
+    """
+    if placement not in PLACEMENTS:
+        raise Exception('unknown exit placement: ' + placement)
+    generator = random.Random(seed)
+    walls = [[generator.random() < wallDensity for y in range(height)] for x in range(width)]
+    start = (0, 0)
+    walls[0][0] = False
+    # breadth first from the start; anything it does not reach becomes a wall
+    order = [start]
+    distances = {start: 0}
+    for x, y in order:
+        for nx, ny in [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]:
+            if 0 <= nx < width and 0 <= ny < height and not walls[nx][ny] and (nx, ny) not in distances:
+                distances[(nx, ny)] = distances[(x, y)] + 1
+                order.append((nx, ny))
+    cells = order[1:]
+    if len(cells) < len(exits):
+        raise Exception('only %d open cells for %d exits; lower the wall density' % (len(cells), len(exits)))
+    placed = {}
+    for i, reward in enumerate(exits):
+        candidates = [cell for cell in cells if cell not in placed]
+        if placement == 'corner' and i == 0:
+            cell = candidates[-1]
+        else:
+            if placement == 'border':
+                candidates = [(x, y) for x, y in candidates if x in (0, width - 1) or y in (0, height - 1)] \
+                             or candidates
+            cell = generator.choice(candidates)
+        placed[cell] = int(reward)
+    rows = []
+    for y in reversed(range(height)):
+        row = []
+        for x in range(width):
+            if (x, y) == start:
+                row.append('S')
+            elif (x, y) in placed:
+                row.append(placed[(x, y)])
+            elif (x, y) in distances:
+                row.append(' ')
+            else:
+                row.append('#')
+        rows.append(row)
+    return rows
+
+def generateGrid(width, height, wallDensity=0.2, exits=(1, -1), placement='corner', seed=0,
+                 noise=0.2, livingReward=0.0):
+    "A random Gridworld (see generateRows) with the given noise and living reward"
+    mdp = gridworld.Gridworld(generateRows(width, height, wallDensity, exits, placement, seed))
+    mdp.setNoise(noise)
+    mdp.setLivingReward(livingReward)
+    return mdp
+
+def gridText(rows):
+    "The rows of a grid as text, one character per cell; exits show as + or -"
+    lines = []
+    for row in rows:
+        line = ''
+        for cell in row:
+            if type(cell) == int:
+                cell = cell > 0 and '+' or '-'
+            line += cell
+        lines.append(line)
+    return '\n'.join(lines)
+
+if __name__ == '__main__':
+    from optparse import OptionParser
+    parser = OptionParser('python gridworldGenerator.py <width> <height> <options>')
+    parser.add_option('-w', '--wallDensity', dest='wallDensity', type='float', default=0.2)
+    parser.add_option('-e', '--exits', dest='exits', default='1,-1',
+                      help='comma separated exit rewards [Default: %default]')
+    parser.add_option('-p', '--placement', dest='placement', default='corner',
+                      help='exit placement, one of ' + ', '.join(PLACEMENTS) + ' [Default: %default]')
+    parser.add_option('-s', '--seed', dest='seed', type='int', default=0)
+    options, args = parser.parse_args(sys.argv[1:])
+    if len(args) != 2:
+        parser.error('give the width and the height')
+    exits = [int(reward) for reward in options.exits.split(',')]
+    print gridText(generateRows(int(args[0]), int(args[1]), options.wallDensity, exits, options.placement,
+                                options.seed))
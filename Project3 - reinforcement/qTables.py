@@ -0,0 +1,186 @@
+# qTables.py
+# ----------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Q-tables kept in arrays, for QLearningAgent with qTable='array'.
+
+A util.Counter keyed by (state, action) hashes the whole state for every
+Q-value it looks up, and a Pacman GameState hashes its food grid cell by
+cell.  A QTable turns each state into a small integer once, through a state
+encoder, and keeps the Q-values of a state as one row of a states x actions
+array, so the best action of a state is one argmax over the columns of its
+legal actions.  With numpy the table is a numpy array that doubles its rows
+as states come in; without it, a list of rows.
+
+The encoder decides which states are the same:
+
+  StateEncoder        a state is its own key, as in the Counter
+  PacmanStateEncoder  a GameState is keyed by the positions and scared timers
+                      of the agents, the directions of the ghosts (a ghost
+                      cannot turn back), the food and the capsules; states
+                      that differ only in score or in the direction Pacman
+                      faces share their Q-values
+
+  python pacman.py -p PacmanQAgent -x 2000 -n 2010 -l smallGrid -a qTable=array,encoder=PacmanStateEncoder
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class StateEncoder:
+    "Keys every state by itself"
+    def encode(self, state):
+        return state
+
+class PacmanStateEncoder:
+    """
+    Keys a Pacman GameState by what decides its moves and rewards from now
+    on.  The ghosts' directions are kept, since a ghost cannot reverse;
+    Pacman's direction and the score are left out.
+    """
+    def encode(self, state):
+        data = state.data
+        food = 0
+        bit = 1
+        for column in data.food.data:
+            for cell in column:
+                if cell: food |= bit
+                bit <<= 1
+        pacman = data.agentStates[0]
+        agents = ((pacman.configuration.pos, pacman.scaredTimer),) + \
+                 tuple([(ghost.configuration.pos, ghost.configuration.direction, ghost.scaredTimer)
+                        for ghost in data.agentStates[1:]])
+        return (agents, food, tuple(data.capsules))
+
+class QTable:
+    """
+    Q-values in a table of states x actions.  States get dense ids, in the
+    order they are first written; actions get columns in the order they are
+    first seen.  Reading never adds a state: the Q-values of a state that was
+    never written are 0.
+    """
+    def __init__(self, encoder=None, initialRows=256):
+        if encoder == None:
+            encoder = StateEncoder()
+        self.encoder = encoder
+        self.ids = {}
+        self.columns = {}
+        self.actions = []
+        self.legalColumns = {}
+        # the last states looked up, by identity: an update looks up the
+        # state that the action before it was chosen in
+        self.recent = [(None, None), (None, None)]
+        if numpy != None:
+            self.values = numpy.zeros((initialRows, 1))
+        else:
+            self.values = []
+
+    def __len__(self):
+        "The number of states in the table"
+        return len(self.ids)
+
+    def stateId(self, state, add=False):
+        "The id of state, or None if it is not in the table and add is False"
+        for seen, stateId in self.recent:
+            if seen is state and stateId != None:
+                return stateId
+        key = self.encoder.encode(state)
+        stateId = self.ids.get(key)
+        if stateId == None:
+            if not add:
+                return None
+            stateId = self.ids[key] = len(self.ids)
+            if numpy == None:
+                self.values.append([])
+            elif stateId == len(self.values):
+                self.values = numpy.vstack([self.values, numpy.zeros(self.values.shape)])
+        self.recent = [self.recent[1], (state, stateId)]
+        return stateId
+
+    def column(self, action):
+        "The column of action, added if it is new"
+        column = self.columns.get(action)
+        if column == None:
+            column = self.columns[action] = len(self.actions)
+            self.actions.append(action)
+            if numpy != None and column == self.values.shape[1]:
+                self.values = numpy.hstack([self.values, numpy.zeros((len(self.values), 1))])
+        return column
+
+    def getColumns(self, actions):
+        "The columns of a sequence of actions, as an index array with numpy"
+        actions = tuple(actions)
+        columns = self.legalColumns.get(actions)
+        if columns == None:
+            columns = [self.column(action) for action in actions]
+            if numpy != None:
+                columns = numpy.array(columns, dtype=int)
+            self.legalColumns[actions] = columns
+        return columns
+
+    def getQValue(self, state, action):
+        stateId = self.stateId(state)
+        column = self.columns.get(action)
+        if stateId == None or column == None:
+            return 0.0
+        if numpy != None:
+            return float(self.values[stateId, column])
+        row = self.values[stateId]
+        if column < len(row):
+            return row[column]
+        return 0.0
+
+    def setQValue(self, state, action, value):
+        stateId = self.stateId(state, True)
+        column = self.column(action)
+        if numpy != None:
+            self.values[stateId, column] = value
+            return
+        row = self.values[stateId]
+        if column >= len(row):
+            row.extend([0.0] * (column + 1 - len(row)))
+        row[column] = value
+
+    def rowValues(self, stateId, actions):
+        "The Q-values of actions in the state with id stateId"
+        columns = self.getColumns(actions)
+        if numpy != None:
+            return self.values[stateId, columns]
+        row = self.values[stateId]
+        return [column < len(row) and row[column] or 0.0 for column in columns]
+
+    def maxQValue(self, state, actions):
+        "The highest Q-value of actions in state, 0 if there are no actions"
+        if len(actions) == 0:
+            return 0.0
+        stateId = self.stateId(state)
+        if stateId == None:
+            return 0.0
+        if numpy != None:
+            return float(self.rowValues(stateId, actions).max())
+        return max(self.rowValues(stateId, actions))
+
+    def bestAction(self, state, actions):
+        "The action with the highest Q-value in state, the first one on ties; None if there are no actions"
+        if len(actions) == 0:
+            return None
+        stateId = self.stateId(state)
+        if stateId == None:
+            return actions[0]
+        values = self.rowValues(stateId, actions)
+        if numpy != None:
+            return actions[int(values.argmax())]
+        return actions[values.index(max(values))]
@@ -15,6 +15,7 @@
 from game import *
 from learningAgents import ReinforcementAgent
 from featureExtractors import *
+from qTables import QTable, StateEncoder, PacmanStateEncoder
 
 import random,util,math,time
 
@@ -37,11 +38,18 @@ class QLearningAgent(ReinforcementAgent):
       Functions you should use
         - self.getLegalActions(state)
           which returns legal actions for a state
+
+      With qTable='array' the Q-values are kept in a QTable (see
+      qTables.py) instead of a Counter, with states told apart by the
+      state encoder class named by encoder.
     """
     "---------------------------------------------------------------------------Question 4"
-    def __init__(self, **args):
+    def __init__(self, qTable='counter', encoder='StateEncoder', **args):
         "You can initialize Q-values here..."
         ReinforcementAgent.__init__(self, **args)
+        self.qTable = None
+        if qTable == 'array':
+            self.qTable = QTable(util.lookup(encoder, globals())())
 
         "*** YOUR CODE HERE ***"
         """ FUNCTIONALITY DESCRIPTION
@@ -77,6 +85,8 @@ class QLearningAgent(ReinforcementAgent):
              would be the initialized value which is 0.0
         
         """
+        if self.qTable != None:
+           return self.qTable.getQValue(state, action)
         "the two-variable value is initilized here"
         qDictComp = (state, action) 
         
@@ -118,6 +128,8 @@ class QLearningAgent(ReinforcementAgent):
         
         
         """
+        if self.qTable != None:
+           return self.qTable.maxQValue(state, self.getLegalActions(state))
         actionList = self.getLegalActions(state)
         qValList = []
         
@@ -156,6 +168,8 @@ class QLearningAgent(ReinforcementAgent):
               would be the one associated with the maximum value of Q 
               for that state
         """        
+        if self.qTable != None:
+           return self.qTable.bestAction(state, self.getLegalActions(state))
         actionList = self.getLegalActions(state)
         #print actionList  
         
@@ -286,6 +300,9 @@ class QLearningAgent(ReinforcementAgent):
         R = reward
         
         sample = R + Gamma*vNext
+        if self.qTable != None:
+           self.qTable.setQValue(state, action, (1-ALPHA) * vCurrent + ALPHA * sample)
+           return
         self.qDict[(state,action)] =  (1-ALPHA) * vCurrent + ALPHA * sample
         
         #util.raiseNotDefined()
@@ -340,6 +357,8 @@ class ApproximateQAgent(PacmanQAgent):
     def __init__(self, extractor='IdentityExtractor', **args):
         self.featExtractor = util.lookup(extractor, globals())()
         PacmanQAgent.__init__(self, **args)
+        # the weights take the place of a Q-table
+        self.qTable = None
         self.weights = util.Counter()
         
 
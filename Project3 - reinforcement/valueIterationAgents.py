@@ -13,6 +13,7 @@
 
 
 import mdp, util
+import compiledMdp
 
 from learningAgents import ValueEstimationAgent
 
@@ -210,3 +211,135 @@ class ValueIterationAgent(ValueEstimationAgent):
 
     def getQValue(self, state, action):
         return self.computeQValueFromValues(state, action)
+
+
+class CompiledValueIterationAgent(ValueEstimationAgent):
+    """
+        A ValueIterationAgent that compiles the mdp into arrays once
+        (see compiledMdp.py) and runs each sweep of value iteration as
+        a few array operations.  It stops after the given number of
+        iterations, or as soon as a sweep changes no value by more than
+        tolerance.  With the same number of sweeps it finds the same
+        values as ValueIterationAgent, up to rounding; actions whose
+        Q-values tie may be told apart by that rounding.
+
+        A model that was already compiled can be passed in as
+        compiled, to run value iteration on it again.
+    """
+    def __init__(self, mdp, discount = 0.9, iterations = 100, tolerance = None, compiled = None):
+        self.mdp = mdp
+        self.discount = discount
+        self.iterations = iterations
+        self.tolerance = tolerance
+        if compiled == None:
+            compiled = compiledMdp.CompiledMDP(mdp)
+        self.compiled = compiled
+        self.setValues(self.runValueIteration())
+
+    def runValueIteration(self):
+        "Solves the compiled model; sets the number of sweeps and of state backups it took"
+        values, self.sweeps = compiledMdp.valueIteration(self.compiled, self.discount, self.iterations, self.tolerance)
+        self.backups = self.sweeps * len(self.compiled.activeStates)
+        return values
+
+    def setValues(self, values):
+        "Keeps the value vector of the compiled model and the Q-values and policy it implies"
+        self.vector = values
+        self.values = self.compiled.valueCounter(values)
+        self.qValues = self.compiled.qValues(values, self.discount)
+        self.policyRows = self.compiled.greedyRows(self.qValues)
+
+    def getValue(self, state):
+        return self.values[state]
+
+    def computeQValueFromValues(self, state, action):
+        row = self.compiled.row(state, action)
+        if row == None:
+            # not in the compiled model, e.g. an action of a terminal state
+            return sum([prob * (self.mdp.getReward(state, action, nextState) + self.discount * self.values[nextState])
+                        for nextState, prob in self.mdp.getTransitionStatesAndProbs(state, action)])
+        return float(self.qValues[row])
+
+    def computeActionFromValues(self, state):
+        s = self.compiled.index.get(state)
+        if s == None or self.policyRows[s] < 0:
+            return None
+        return self.compiled.actions[s][self.policyRows[s] - self.compiled.firstRow[s]]
+
+    def getPolicy(self, state):
+        return self.computeActionFromValues(state)
+
+    def getAction(self, state):
+        "Returns the policy at the state (no exploration)."
+        return self.computeActionFromValues(state)
+
+    def getQValue(self, state, action):
+        return self.computeQValueFromValues(state, action)
+
+
+class AsynchronousValueIterationAgent(CompiledValueIterationAgent):
+    """
+        Value iteration in place (Gauss-Seidel): each iteration backs
+        up the states one after the other, and every backup already
+        uses the values updated before it, so fewer sweeps are needed
+        to reach the same tolerance.
+    """
+    def runValueIteration(self):
+        values, self.sweeps, self.backups = compiledMdp.gaussSeidelValueIteration(
+            self.compiled, self.discount, self.iterations, self.tolerance)
+        return values
+
+
+class PrioritizedSweepingValueIterationAgent(CompiledValueIterationAgent):
+    """
+        Prioritized sweeping: backs up the state with the largest
+        Bellman error first, and checks again only the predecessors of
+        each state it changes.  Here iterations counts single state
+        backups, not sweeps, and the agent stops early once no Bellman
+        error is above tolerance (0 by default).
+    """
+    def runValueIteration(self):
+        self.sweeps = None
+        values, self.backups = compiledMdp.prioritizedSweeping(
+            self.compiled, self.discount, self.iterations, self.tolerance or 0.0)
+        return values
+
+
+class PolicyIterationAgent(CompiledValueIterationAgent):
+    """
+        Policy iteration over the compiled mdp: solves for the values
+        of the current policy, makes the policy greedy for them, and
+        repeats until the policy stays the same.  Here iterations
+        counts rounds of policy iteration.
+    """
+    evaluationSweeps = None
+
+    def runValueIteration(self):
+        values, self.solvedRows, self.rounds = compiledMdp.policyIteration(
+            self.compiled, self.discount, self.iterations, self.evaluationSweeps, self.tolerance)
+        self.sweeps = self.backups = None
+        return values
+
+    def setValues(self, values):
+        CompiledValueIterationAgent.setValues(self, values)
+        # the policy that was evaluated, not one that breaks ties anew
+        self.policyRows = self.solvedRows
+
+
+class ModifiedPolicyIterationAgent(PolicyIterationAgent):
+    """
+        Modified policy iteration: like PolicyIterationAgent, but each
+        round only runs evaluationSweeps sweeps of the policy's Bellman
+        equation from the last values instead of solving it, and stops
+        once the policy is stable and no value changes by more than
+        tolerance.
+    """
+    def __init__(self, mdp, discount = 0.9, iterations = 100, tolerance = None, compiled = None, evaluationSweeps = 5):
+        self.evaluationSweeps = int(evaluationSweeps)
+        PolicyIterationAgent.__init__(self, mdp, discount, iterations, tolerance, compiled)
+
+    def runValueIteration(self):
+        values = PolicyIterationAgent.runValueIteration(self)
+        self.sweeps = self.rounds * self.evaluationSweeps
+        self.backups = self.sweeps * len(self.compiled.activeStates)
+        return values
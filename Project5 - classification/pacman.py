@@ -46,7 +46,7 @@ from game import Actions
 from util import nearestPoint
 from util import manhattanDistance
 import util, layout
-import sys, types, time, random, os
+import sys, types, time, random, os, heapq
 
 ###################################################
 # YOUR INTERFACE TO THE PACMAN WORLD: A GameState #
@@ -71,10 +71,41 @@ class GameState:
     # Accessor methods: use these to access state data #
     ####################################################
 
-    # static variable keeps track of which states have had getLegalActions called
+    # static variables that keep track of the states generateSuccessor makes;
+    # nothing is kept unless trackExploration switches it on
+    exploration = None
     explored = set()
+    exploredSketch = None
+    def trackExploration(mode='set'):
+        """
+        Switches the tracking of the states made by generateSuccessor:
+          None      nothing is tracked (the default), so games pay nothing for it
+          'set'     every state is kept in GameState.explored; the autograder
+                    counts the states searched by an agent this way
+          'sketch'  GameState.exploredSketch counts the states and estimates how
+                    many of them are distinct in a fixed amount of memory
+        Tracking starts afresh every time it is switched.
+        """
+        if mode not in (None, 'set', 'sketch'):
+            raise Exception('Unknown exploration tracking mode: ' + str(mode))
+        GameState.exploration = mode
+        GameState.explored = set()
+        GameState.exploredSketch = None
+        if mode == 'sketch':
+            GameState.exploredSketch = ExplorationSketch()
+    trackExploration = staticmethod(trackExploration)
+
+    def recordExplored(parent, child):
+        if GameState.exploration == 'set':
+            GameState.explored.add(parent)
+            GameState.explored.add(child)
+        elif GameState.exploration == 'sketch':
+            GameState.exploredSketch.add(parent)
+            GameState.exploredSketch.add(child)
+    recordExplored = staticmethod(recordExplored)
+
     def getAndResetExplored():
-        tmp = GameState.explored.copy()
+        tmp = GameState.explored
         GameState.explored = set()
         return tmp
     getAndResetExplored = staticmethod(getAndResetExplored)
@@ -120,8 +151,8 @@ class GameState:
         # Book keeping
         state.data._agentMoved = agentIndex
         state.data.score += state.data.scoreChange
-        GameState.explored.add(self)
-        GameState.explored.add(state)
+        if GameState.exploration != None:
+            GameState.recordExplored(self, state)
         return state
 
     def getLegalPacmanActions( self ):
@@ -253,6 +284,36 @@ class GameState:
         """
         self.data.initialize(layout, numGhostAgents)
 
+class ExplorationSketch:
+    """
+    Counts the states added to it and estimates how many of them are distinct
+    while keeping only the k smallest hash values seen (a k minimum values
+    sketch).  The hashes are spread over [0, 1), so if the k-th smallest is h
+    there are about (k - 1) / h distinct states; the estimate is exact until
+    k distinct states have been seen and within about 1/sqrt(k) after.
+    """
+    def __init__(self, k=256):
+        self.k = k
+        self.count = 0
+        self.smallest = []  # max-heap of the k smallest hashes, stored negated
+        self.members = set()
+
+    def add(self, state):
+        self.count += 1
+        h = ((hash(state) * 2654435761) & 0xffffffff) / 4294967296.0
+        if h in self.members: return
+        if len(self.smallest) < self.k:
+            heapq.heappush(self.smallest, -h)
+            self.members.add(h)
+        elif h < -self.smallest[0]:
+            self.members.discard(-heapq.heapreplace(self.smallest, -h))
+            self.members.add(h)
+
+    def distinct(self):
+        if len(self.smallest) < self.k:
+            return len(self.smallest)
+        return int((self.k - 1) / -self.smallest[0])
+
 ############################################################################
 #                     THE HIDDEN SECRETS OF PACMAN                         #
 #                                                                          #
@@ -331,7 +392,8 @@ class PacmanRules:
         """
         Returns a list of possible actions.
         """
-        return Actions.getPossibleActions( state.getPacmanState().configuration, state.data.layout.walls )
+        conf = state.data.agentStates[0].configuration
+        return state.data.layout.getMoveTable().getPossibleActions( conf )
     getLegalActions = staticmethod( getLegalActions )
 
     def applyAction( state, action ):
@@ -389,13 +451,7 @@ class GhostRules:
         reach a dead end, but can turn 90 degrees at intersections.
         """
         conf = state.getGhostState( ghostIndex ).configuration
-        possibleActions = Actions.getPossibleActions( conf, state.data.layout.walls )
-        reverse = Actions.reverseDirection( conf.direction )
-        if Directions.STOP in possibleActions:
-            possibleActions.remove( Directions.STOP )
-        if reverse in possibleActions and len( possibleActions ) > 1:
-            possibleActions.remove( reverse )
-        return possibleActions
+        return state.data.layout.getMoveTable().getGhostActions( conf )
     getLegalActions = staticmethod( getLegalActions )
 
     def applyAction( state, action, ghostIndex):
@@ -523,6 +579,8 @@ def readCommand( argv ):
                       help='Turns on exception handling and timeouts during games', default=False)
     parser.add_option('--timeout', dest='timeout', type='int',
                       help=default('Maximum length of time an agent can spend computing in a single game'), default=30)
+    parser.add_option('--exploration', dest='exploration', type='choice', choices=['set', 'sketch'],
+                      help='Track the states agents generate, exactly (set) or in bounded memory (sketch)', default=None)
 
     options, otherjunk = parser.parse_args(argv)
     if len(otherjunk) != 0:
@@ -532,6 +590,8 @@ def readCommand( argv ):
     # Fix the random seed
     if options.fixRandomSeed: random.seed('cs188')
 
+    if options.exploration: GameState.trackExploration(options.exploration)
+
     # Choose a layout
     args['layout'] = layout.getLayout( options.layout )
     if args['layout'] == None: raise Exception("The layout " + options.layout + " cannot be found")
@@ -663,6 +723,12 @@ def runGames( layout, pacman, ghosts, display, numGames, record, numTraining = 0
         print 'Win Rate:      %d/%d (%.2f)' % (wins.count(True), len(wins), winRate)
         print 'Record:       ', ', '.join([ ['Loss', 'Win'][int(w)] for w in wins])
 
+    if GameState.exploration == 'set':
+        print 'Explored:      %d distinct states' % len(GameState.explored)
+    elif GameState.exploration == 'sketch':
+        sketch = GameState.exploredSketch
+        print 'Explored:      %d states generated, about %d distinct' % (sketch.count, sketch.distinct())
+
     return games
 
 if __name__ == '__main__':